@@ -20,3 +20,19 @@ if __name__ == "__main__":
     am = 1 # hydrogen
     Dw = BasicP.get_Doppler_width(wave, Te, Vt, am)
     print(f"Doppler width of {wave*1.E+8:1.1f}[A] of hydrogen with {Vt*1E-5:1.1f}[km/s] turbulent velocity : {Dw*1.E+8:1.1f}[A]")
+
+    #--- packed mesh of many lines
+    import numpy as np
+    p0 = np.array([1.E+15, 2.E+15, 3.E+15])
+    dp = BasicP.get_Doppler_width(p0, Te, Vt, am)
+    nX = np.array([5, 2, 11])
+    offsets, line, x, p = BasicP.make_packed_mesh(p0, dp, 4., nX)
+    assert (offsets == [0, 5, 7, 18]).all()
+    for k in range(p0.size):
+        sl = slice(offsets[k], offsets[k+1])
+        assert (line[sl] == k).all()
+        assert np.allclose( x[sl], np.linspace(-4., 4., nX[k]) )
+        assert np.allclose( p[sl], p0[k] + x[sl] * dp[k] )
+    #--- per line reduction over the flat mesh
+    assert np.allclose( np.add.reduceat(x, offsets[:-1]), 0. )
+    assert (np.add.reduceat(np.ones_like(x), offsets[:-1]) == nX).all()
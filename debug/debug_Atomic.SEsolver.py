@@ -29,7 +29,8 @@ if __name__ == "__main__":
 
     #--- compute collision excitation/de-excitation rate coefficient
     CE_fac = ColExcite.interpolate_CE_fac(_table=atom.CE_table[:,:], _Te=Te, _Te_table=atom.CE_Te_table[:],
-                            _f1=atom.CE_coe.f1[:], _f2=atom.CE_coe.f2[:])
+                            _f1=atom.CE_coe.f1[:], _f2=atom.CE_coe.f2[:],
+                            _Bsp=(atom.CE_Bsp_t, atom.CE_Bsp_c, atom.CE_Bsp_k))
     CEij = ColExcite.get_CE_rate_coe(_CE_fac=CE_fac, _Te=Te, _gi=atom.CE_coe.gi[:],
                             _dEij=atom.CE_coe.dEij[:], _type=atom.CE_type)
     CEji = ColExcite.Cij_to_Cji(_Cij=CEij,  _ni_LTE=ni_LTE, _nj_LTE=nj_LTE)
@@ -0,0 +1,62 @@
+if __name__ == "__main__":
+
+    import sys
+    sys.path.append("..")
+
+    import numpy as np
+    from src.Structure import AtomCls
+    from src.Atomic import LTELib, ColExcite, SEsolver
+    from src.RadiativeTransfer import Quadrature, ALI
+
+    file     = "../atom/C_III/C_III.Level"
+    file_Aji = "../atom/C_III/Einstein_A/Nist.Aji"
+    file_CEe = "../atom/C_III/Collisional_Excitation/Berrington_et_al_1985.Electron"
+    atom = AtomCls.Atom(file, _file_Aji=file_Aji, _file_CEe=file_CEe)
+
+    #--- isothermal finite slab without incident radiation (default _I_top = _I_bottom = 0)
+    nDepth = 60
+    z = 1.E+9 - np.concatenate([[0.], np.logspace(3, 9, nDepth-1)])
+    Te = np.full(nDepth, 2E+04)
+    ne = np.full(nDepth, 1E+10)
+    nTot = 1E+6
+
+    #--- LTE population as the initial guess
+    n_LTE = LTELib.get_LTE_ratio(_erg=atom.Level.erg[:], _g=atom.Level.g[:],
+                    _stage=atom.Level.stage[:], _Te=Te, _Ne=ne)
+
+    #--- collisional rate matrix of all depths
+    CE_fac = ColExcite.interpolate_CE_fac(_table=atom.CE_table[:,:], _Te=Te, _Te_table=atom.CE_Te_table[:],
+                            _f1=atom.CE_coe.f1[:], _f2=atom.CE_coe.f2[:],
+                            _Bsp=(atom.CE_Bsp_t, atom.CE_Bsp_c, atom.CE_Bsp_k))
+    CEij = ColExcite.get_CE_rate_coe(_CE_fac=CE_fac, _Te=Te, _gi=atom.CE_coe.gi[:],
+                            _dEij=atom.CE_coe.dEij[:], _type=atom.CE_type)
+    CEji = ColExcite.Cij_to_Cji(_Cij=CEij, _ni_LTE=n_LTE[:,atom.CE_coe.idxI[:]], _nj_LTE=n_LTE[:,atom.CE_coe.idxJ[:]])
+    Cmat = np.zeros((nDepth, atom.nLevel, atom.nLevel), np.double)
+    SEsolver.setMatrixC(_Cmat=Cmat, _Cji=CEji, _Cij=CEij,
+                _idxI=atom.CE_coe.idxI[:], _idxJ=atom.CE_coe.idxJ[:], _Ne=ne)
+
+    #--- quadrature, gaussian profile
+    #    the wide mesh reaches far wings where the line opacity underflows to 0
+    dD = atom.get_Doppler_width(Te, 1E+6, 12.)
+    for x in (np.linspace(-5, 5, 41), np.linspace(-30, 30, 121)):
+        quad = Quadrature.LineQuadrature(atom, x, dD[0], dD, _nMu=6)
+
+        n, info = ALI.solve_ALI(quad, Cmat, n_LTE * nTot, z, _maxIter=400, _verbose=True)
+        assert np.isfinite(n).all(), "non-finite population."
+        print(f"|x| <= {x[-1]}, nX = {x.size}")
+        print(info["converged"], info["nIter"])
+        print("departure coefficients at the top/bottom :")
+        print(n[0] / (n_LTE[0]*nTot))
+        print(n[-1] / (n_LTE[-1]*nTot))
+
+    #--- optically thin limit : J -> 0, SE with spontaneous emission and collisions only
+    nTot_thin = 1E-6
+    n_thin, info = ALI.solve_ALI(quad, Cmat, n_LTE * nTot_thin, z, _maxIter=400)
+    assert info["converged"]
+    Rmat = np.zeros((nDepth, atom.nLevel, atom.nLevel), np.double)
+    zeros = np.zeros(atom.nLine, np.double)
+    SEsolver.setMatrixR(Rmat, atom.Line.AJI[:], zeros, zeros, atom.Line.idxI[:], atom.Line.idxJ[:])
+    n_SE = SEsolver.solveSE_batch(Rmat, Cmat) * nTot_thin
+    err = np.max( np.abs(n_thin - n_SE) / n_SE )
+    print(f"optically thin limit, max relative difference to SE without radiation : {err:.2e}")
+    assert err < 1E-3
@@ -0,0 +1,45 @@
+if __name__ == "__main__":
+
+    import sys
+    sys.path.append("..")
+
+    from src.RadiativeTransfer import LambdaOperator
+
+    import numpy as np
+
+    #--- repeated, tiny and near-equal intervals of optical depth
+    taus = {
+        "regular"    : np.concatenate([[0.], np.logspace(-4, 2, 40)]),
+        "repeated"   : np.array([0., 0., 1.E-20, 1., 1., 5.]),
+        "near-equal" : np.array([0., 1.E-10, 1.E-6, 1., 1.+1.E-10, 1.+1.E-9, 5.]),
+        "tiny"       : np.array([0., 1.E-12, 2.E-12, 3.E-5, 2.E-4, 1.E-2]),
+    }
+
+    for key, tau in taus.items():
+        for semi_infinite in (True, False):
+            lo = LambdaOperator.LambdaOperator(tau, _semi_infinite=semi_infinite)
+            assert np.isfinite(lo.Lambda).all(), key
+            assert (lo.Lambda >= -1.E-15).all(), key      # round off far from the diagonal
+            assert (lo.diagonal >= 0.).all(), key
+
+            #--- S = 1, J = 1 - E2(tau)/2 (semi-infinite), - E2(T-tau)/2 (finite slab)
+            E2, _ = LambdaOperator.get_E2_E3(tau)
+            J_ref = 1. - 0.5 * E2
+            if not semi_infinite:
+                E2, _ = LambdaOperator.get_E2_E3(tau[-1] - tau)
+                J_ref -= 0.5 * E2
+            J = lo.get_J( np.ones_like(tau) )[0]
+            err = np.max( np.abs(J - J_ref) )
+            print(f"{key:>10s} semi-infinite={semi_infinite!s:>5s} : max |J - J_ref| = {err:.2e}")
+            assert err < 1.E-6, key
+
+    #--- a near-equal pair converges to the repeated one
+    S = lambda _tau: 1. + _tau * np.exp(-_tau)
+    for eps in (1.E-6, 1.E-10, 1.E-14):
+        tau_eps = np.array([0., eps, 1., 1.+eps, 5.])
+        tau_0 = np.array([0., 0., 1., 1., 5.])
+        J_eps = LambdaOperator.LambdaOperator(tau_eps).get_J( S(tau_eps) )[0]
+        J_0 = LambdaOperator.LambdaOperator(tau_0).get_J( S(tau_0) )[0]
+        err = np.max( np.abs(J_eps - J_0) )
+        print(f"near-equal pairs eps = {eps:.0e} : max |J_eps - J_0| = {err:.2e}")
+        assert err < 100. * eps + 1.E-8      # 1.E-8 : accuracy of Special.E1
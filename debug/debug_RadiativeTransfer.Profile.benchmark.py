@@ -0,0 +1,37 @@
+if __name__ == "__main__":
+
+    import sys
+    sys.path.append("..")
+
+    from src.RadiativeTransfer import Profile
+
+    import time
+    import numpy as np
+    from scipy.special import wofz
+
+    table = Profile.VoigtTable()
+
+    engines = {
+        "wofz"      : lambda _a, _x: wofz(_x + 1j*_a).real / np.sqrt(np.pi),
+        "Voigt"     : Profile.Voigt,
+        "Humlicek"  : Profile.Voigt_Humlicek,
+        "VoigtTable": table,
+    }
+
+    #--- (a, x) meshes inside the table and covering all 4 regions of Humlicek(1982)
+    for x_max in (10., 30.):
+        a = np.logspace(-4, 1, 301, dtype=np.double)[:,None]
+        x = np.linspace(-x_max, x_max, 2001, dtype=np.double)[None,:]
+        a, x = np.broadcast_arrays(a, x)
+
+        ref = engines["wofz"](a, x)
+        print(f"|x| <= {x_max}")
+        print(f"{'engine':>12s} {'time [ms]':>10s} {'max rel err':>12s}")
+        for key, func in engines.items():
+            func(a[:2,:2], x[:2,:2])   # warm up (numba compilation)
+            t0 = time.perf_counter()
+            for _ in range(5):
+                res = func(a, x)
+            dt = (time.perf_counter() - t0) / 5 * 1.E3
+            err = np.max( np.abs(res - ref) / ref )
+            print(f"{key:>12s} {dt:10.2f} {err:12.3e}")
@@ -23,3 +23,16 @@ if __name__ == "__main__":
     line_index3 = atom.line_ctj_to_line_index(line_ctj)
 
     assert line_index == line_index2 == line_index3
+
+    #--- packed frequency mesh of all lines
+    import numpy as np
+    from src.RadiativeTransfer import Profile
+    offsets, line, x, f = atom.make_freq_mesh(_Te=2.E+4, _Vt=5.E+5, _am=12., _x_max=5., _nX=41)
+    assert offsets[-1] == atom.nLine * 41 == f.size
+    assert np.allclose( f[offsets[:-1]+20], atom.Line.f0[:] )
+    #--- profile of all lines without per line allocation, normalized to ~1 on the mesh
+    dD = atom.get_Doppler_width(2.E+4, 5.E+5, 12.)
+    phi = Profile.Voigt(1.E-3, x) / dD[line]
+    dx = 10. / 40.
+    norm = np.add.reduceat(phi, offsets[:-1]) * dx * dD
+    assert np.allclose(norm, 1., atol=1.E-3), norm
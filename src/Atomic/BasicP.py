@@ -3,6 +3,8 @@
 #     calculations related to naive/basic physics process
 ################################################################################
 
+import numpy as np
+
 from .. import Constants as Cst
 
 
@@ -142,3 +144,62 @@ def get_Doppler_width(p0, Te, Vt, am):
     eta0_ = (2.*Cst.k_*Te/(Cst.mH_*am) + Vt*Vt)**(0.5)
     dp = p0 * eta0_ / Cst.c_
     return dp
+
+################################################################################
+# packed mesh of many lines
+################################################################################
+
+def make_packed_mesh(p0, dp, x_max, nX):
+    r"""
+    Build the meshes of many lines at once, packed into one flat array.
+    mesh of line k has nX[k] points evenly spaced in
+    :math:`[-x_{max,k}, x_{max,k}]` Doppler widths around p0[k].
+
+    Parameters
+    ----------
+
+    p0 : np.double or array-like, (nLine,)
+        Frequency in any frequency unit or Wavelength in any length unit
+    dp : np.double or array-like, (nLine,)
+        Doppler width, same unit with input argument `p0`
+    x_max : np.double or array-like, (nLine,)
+        half width of the mesh in unit of Doppler width, [-]
+    nX : int or array-like of int, (nLine,)
+        number of mesh points of each line, >= 2
+
+    Returns
+    -------
+
+    offsets : np.intp, np.array, (nLine+1,)
+        mesh of line k is `p[offsets[k]:offsets[k+1]]`
+
+    line : np.intp, np.array, (nTot,)
+        line of each mesh point
+
+    x : np.double, np.array, (nTot,)
+        Doppler width normalized mesh, [-]
+
+    p : np.double, np.array, (nTot,)
+        Frequency/Wavelength mesh, same unit with input argument `p0`
+
+    Notes
+    -----
+
+    Quantities of lines are brought to the flat mesh by fancy indexing with `line`,
+    e.g. `(p - p0[line]) / dp_new[..., line]`, and per line sums over the mesh are
+    `np.add.reduceat(y, offsets[:-1], axis=-1)`.
+    """
+    p0, dp, x_max, nX = np.broadcast_arrays( np.asarray(p0, dtype=np.double), np.asarray(dp, dtype=np.double),
+                                             np.asarray(x_max, dtype=np.double), np.asarray(nX, dtype=np.intp) )
+    assert p0.ndim == 1, "p0, dp, x_max, nX should be 1D arrays."
+    assert (nX >= 2).all(), "each line needs at least 2 mesh points."
+
+    offsets = np.zeros(nX.size+1, dtype=np.intp)
+    np.cumsum(nX, out=offsets[1:])
+
+    line = np.repeat( np.arange(nX.size, dtype=np.intp), nX )
+    local = np.arange(offsets[-1], dtype=np.intp) - offsets[line]
+    x = x_max[line] * ( 2. * local / (nX[line] - 1) - 1. )
+    p = p0[line] + x * dp[line]
+
+    return offsets, line, x, p
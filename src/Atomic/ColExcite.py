@@ -1,9 +1,9 @@
 import numpy as np
 from .. import Constants as Cst
 
-from scipy.interpolate import splrep, splev
+from scipy.interpolate import make_interp_spline, BSpline
 
-def interpolate_CE_fac(_table, _Te, _Te_table, _f1, _f2):
+def interpolate_CE_fac(_table, _Te, _Te_table, _f1, _f2, _Bsp=None):
     r"""
     given temperature, interpolate collisional excitation coefficient
     ( in most case is Effective collisional strength)
@@ -14,7 +14,7 @@ def interpolate_CE_fac(_table, _Te, _Te_table, _f1, _f2):
     _table : np.double, array, (nLine, nTemperature)
         a table of CE coefficient as a function of temperature for interpolation
 
-    _Te : scalar
+    _Te : scalar; np.double, np.array, (...)
         termperature, [:math:`K`]
 
     _Te_table : np.double, array, (nTemperature,)
@@ -26,10 +26,15 @@ def interpolate_CE_fac(_table, _Te, _Te_table, _f1, _f2):
     _f2 : int
         a factor needed to compute CE rate coefficient
 
+    _Bsp : tuple
+        pre-fitted B-spline `(t, c, k)` of `_table`, e.g.
+        `(atom.CE_Bsp_t, atom.CE_Bsp_c, atom.CE_Bsp_k)`,
+        default: None, looked up by `get_CE_Bsp_cached`
+
     Returns
     -------
 
-    _CE_fac : np.double, np.array, (nLine,)
+    _CE_fac : np.double, np.array, (..., nLine)
         the CE coefficient we need to compute CE rate coefficient
 
     Notes
@@ -46,14 +51,146 @@ def interpolate_CE_fac(_table, _Te, _Te_table, _f1, _f2):
         Cambridge University Press, pp. 22, 1992
     """
 
-    _nTran = _table.shape[0]
-    _CE_fac = np.empty(_nTran, dtype=np.double)
-    for k in range(_nTran):
-        #--- numpy linear interpolation
-        #_CE_fac[k] = np.interp(_Te, _Te_table, _table[k,:]) * _f1[k] / _f2[k]
-        #--- scipy B-spline interpolation
-        _Bsp_obj = splrep(x=_Te_table[:], y=_table[k,:])
-        _CE_fac[k] = splev(_Te, _Bsp_obj, ext=3) * _f1[k] / _f2[k]
+    #--- numpy linear interpolation
+    #_CE_fac[k] = np.interp(_Te, _Te_table, _table[k,:]) * _f1[k] / _f2[k]
+    #--- scipy B-spline interpolation
+    if _Bsp is None:
+        _Bsp = get_CE_Bsp_cached(_table, _Te_table)
+    _Bsp_t, _Bsp_c, _Bsp_k = _Bsp
+    _CE_fac = interpolate_CE_fac_Bsp(_Bsp_t, _Bsp_c, _Bsp_k, _Te, _Te_table, _f1, _f2)
+
+    return _CE_fac
+
+def get_CE_Bsp(_table, _Te_table):
+    r"""
+    fit the cubic B-spline of CE coefficient as a function of temperature,
+    for all transitions at once.
+
+    Parameters
+    ----------
+
+    _table : np.double, array, (nLine, nTemperature)
+        a table of CE coefficient as a function of temperature for interpolation
+
+    _Te_table : np.double, array, (nTemperature,)
+        corresponding termperature points in _table, [:math:`K`]
+
+    Returns
+    -------
+
+    _Bsp_t : np.double, np.array, (nKnot,)
+        knots of the B-spline, shared by all transitions, [:math:`K`]
+
+    _Bsp_c : np.double, np.array, (nLine, nTemperature)
+        B-spline coefficients of each transition, [-]
+
+    _Bsp_k : int
+        degree of the B-spline, [-]
+
+    Notes
+    -----
+
+    Same interpolating spline as `scipy.interpolate.splrep(x=_Te_table, y=_table[k,:])`
+    (not-a-knot boundary condition).
+    """
+
+    _Bsp = make_interp_spline(_Te_table[:], _table[:,:].T, k=3)
+    _Bsp_c = np.ascontiguousarray(_Bsp.c.T, dtype=np.double)
+
+    return _Bsp.t, _Bsp_c, _Bsp.k
+
+################################################################################
+# B-splines fitted once per CE table,
+#    keyed by the content of (_table, _Te_table), filled by `AtomCls.Atom`
+################################################################################
+
+CE_Bsp_cache_ = {}
+
+def get_CE_Bsp_key(_table, _Te_table):
+    r"""
+    key of a CE table in `CE_Bsp_cache_`.
+    """
+    return ( np.ascontiguousarray(_table, dtype=np.double).tobytes(),
+             np.ascontiguousarray(_Te_table, dtype=np.double).tobytes() )
+
+def set_CE_Bsp_cache(_table, _Te_table, _Bsp):
+    r"""
+    register the pre-fitted B-spline `(t, c, k)` of a CE table,
+    e.g. by `AtomCls.Atom` after reading or loading the atom.
+    """
+    CE_Bsp_cache_[ get_CE_Bsp_key(_table, _Te_table) ] = _Bsp
+
+def get_CE_Bsp_cached(_table, _Te_table):
+    r"""
+    same as `get_CE_Bsp`, but the B-spline of each CE table is fitted only once.
+
+    Parameters
+    ----------
+
+    _table : np.double, array, (nLine, nTemperature)
+        a table of CE coefficient as a function of temperature for interpolation
+
+    _Te_table : np.double, array, (nTemperature,)
+        corresponding termperature points in _table, [:math:`K`]
+
+    Returns
+    -------
+
+    _Bsp : tuple
+        `(t, c, k)`, see `get_CE_Bsp`
+    """
+    _key = get_CE_Bsp_key(_table, _Te_table)
+    if _key not in CE_Bsp_cache_:
+        CE_Bsp_cache_[_key] = get_CE_Bsp(_table, _Te_table)
+
+    return CE_Bsp_cache_[_key]
+
+def interpolate_CE_fac_Bsp(_Bsp_t, _Bsp_c, _Bsp_k, _Te, _Te_table, _f1, _f2):
+    r"""
+    given temperature, evaluate the pre-fitted B-spline of
+    collisional excitation coefficient.
+
+    Parameters
+    ----------
+
+    _Bsp_t : np.double, np.array, (nKnot,)
+        knots of the B-spline, [:math:`K`]
+
+    _Bsp_c : np.double, np.array, (nLine, nTemperature)
+        B-spline coefficients of each transition, [-]
+
+    _Bsp_k : int
+        degree of the B-spline, [-]
+
+    _Te : scalar; np.double, np.array, (...)
+        termperature, [:math:`K`]
+
+    _Te_table : np.double, array, (nTemperature,)
+        termperature points used to fit the B-spline, [:math:`K`]
+
+    _f1 : int
+        a factor needed to compute CE rate coefficient
+
+    _f2 : int
+        a factor needed to compute CE rate coefficient
+
+    Returns
+    -------
+
+    _CE_fac : np.double, np.array, (..., nLine)
+        the CE coefficient we need to compute CE rate coefficient,
+        (nLine,) for a scalar `_Te`
+
+    Notes
+    -----
+
+    Temperature outside of `_Te_table` is clipped to the boundary value,
+    which is equivalent to `splev(..., ext=3)`.
+    """
+
+    _Te = np.clip(_Te, _Te_table[0], _Te_table[-1])
+    _Bsp = BSpline(_Bsp_t, _Bsp_c.T, _Bsp_k, extrapolate=False)
+    _CE_fac = _Bsp(_Te) * _f1[:] / _f2[:]
 
     return _CE_fac
 
@@ -64,18 +201,18 @@ def Cij_to_Cji(_Cij,  _ni_LTE, _nj_LTE):
     Parameters
     -----------
 
-    _Cij : np.double, np.array, (nLine); scalar
+    _Cij : np.double, np.array, (..., nLine); scalar
         collisional upward rate coefficient, [:math:`cm^{-3} s^{-1}`]
 
-    _ni_LTE : np.double, np.array, (nLine); scalar
+    _ni_LTE : np.double, np.array, (..., nLine); scalar
         population in lower level, [:math:`cm^{-3}`]
 
-    _nj_LTE : np.double, np.array, (nLine); scalar
+    _nj_LTE : np.double, np.array, (..., nLine); scalar
         population in upper level, [:math:`cm^{-3}`]
 
     Returns
     -------
-    _Cji : np.double, np.array, (nLine); scalar
+    _Cji : np.double, np.array, (..., nLine); scalar
         collisional downward rate coefficient, [:math:`cm^{-3} s^{-1}`]
 
     Notes
@@ -83,6 +220,9 @@ def Cij_to_Cji(_Cij,  _ni_LTE, _nj_LTE):
 
     .. math: n_j^{LTE} C_{ji} = n_i^{LTE} C_{ij}
 
+    The leading axes (...) of the arguments are broadcasted against each other,
+    e.g. `_ni_LTE = n_LTE[..., idxI]` for LTE populations of shape (..., nLevel).
+
     """
 
     _Cji = _Cij * _ni_LTE / _nj_LTE
@@ -96,10 +236,10 @@ def get_CE_rate_coe(_CE_fac, _Te, _gi, _dEij, _type):
     Parameters
     ----------
 
-    _CE_fac : np.double, np.array, (nLine,); scalar
+    _CE_fac : np.double, np.array, (..., nLine); scalar
         the coefficient we interpolate from data
 
-    _Te : scalar
+    _Te : scalar; np.double, np.array, (...)
         termperature, [:math:`K`]
 
     _gi : np.uint8, np.array, (nLine,); scalar
@@ -114,7 +254,7 @@ def get_CE_rate_coe(_CE_fac, _Te, _gi, _dEij, _type):
     Returns
     -------
 
-    _CEij : np.double, np.array, (nLine); scalar
+    _CEij : np.double, np.array, (..., nLine); scalar
         collisional excitation rate coefficient, [:math:`cm^{-3} s^{-1}`]
 
     Notes
@@ -131,6 +271,9 @@ def get_CE_rate_coe(_CE_fac, _Te, _gi, _dEij, _type):
         Cambridge University Press, pp. 22, 1992
     """
 
+    #--- broadcast temperature against the transition axis
+    if np.ndim(_Te) > 0:
+        _Te = np.asarray(_Te, dtype=np.double)[...,None]
     _kT = Cst.k_ * _Te
 
     if _type == "ECS":
@@ -129,15 +129,15 @@ def get_LTE_ratio(_erg, _g, _stage, _Te, _Ne):
     _stage : numpy.1darray of np.uint8
         ionization stage, [-]
 
-    _Te : np.double
+    _Te : np.double or array-like, (...)
         electron temperature, [:math:`K`]
 
-    _Ne : np.double
+    _Ne : np.double or array-like, (...)
         electron density, [:math:`cm^{-3}`]
 
     Returns
     --------
-    _nRatio : numpy.1darray of np.double
+    _nRatio : np.double, np.array, (..., nLevel)
         population ratio. [-]
 
     Notes
@@ -147,21 +147,27 @@ def get_LTE_ratio(_erg, _g, _stage, _Te, _Ne):
     there is a jump of ionization stage.
     Finnaly, we normalize the _nRatio array with respec to the total population.
 
+    The ratios between adjacent levels are computed for all levels at once and
+    accumulated with a cumulative product along the level axis.
+    `_Te` and `_Ne` are broadcasted against each other.
+
     """
     _nLevel = _erg.size
-    _nRatio = np.empty(_nLevel, np.double)
-    _nRatio[0] = 1.
-    #kT = Cst.k_*Te
-    for i in range(1, _nLevel):
-        _gj, _gi = _g[i], _g[i-1]
-        if _stage[i] - _stage[i-1] == 0:
-            #nRatio[i] = nRatio[i-1] * gj/gi * np.exp(-(erg[i]-erg[i-1])/kT)
-            _nRatio[i] = _nRatio[i-1] * Boltzmann_distribution(_gi, _gj, _erg[i]-_erg[i-1], _Te)
-        elif _stage[i] - _stage[i-1] == 1:
-            #nRatio[i] = nRatio[i-1] * gj/gi * np.exp(-(erg[i]-erg[i-1])/kT) * Cst.saha_ * Te**(1.5) / Ne
-            _nRatio[i] = _nRatio[i-1] * Saha_distribution(_gi, _gj, _erg[i]-_erg[i-1], _Ne, _Te)
-
-        _nRatio[:] /= _nRatio[:].sum()
+    _Te = np.asarray(_Te, dtype=np.double)[...,None]
+    _Ne = np.asarray(_Ne, dtype=np.double)[...,None]
+
+    #--- population ratio between level i and level i-1
+    _gj, _gi = _g[1:], _g[:-1]
+    _dE = _erg[1:] - _erg[:-1]
+    _isSaha = ( _stage[1:].astype(np.int16) - _stage[:-1] ) == 1
+    _rt = np.where( _isSaha, Saha_distribution(_gi, _gj, _dE, _Ne, _Te),
+                             Boltzmann_distribution(_gi, _gj, _dE, _Te) )
+
+    _shape = np.broadcast(_Te, _Ne).shape[:-1] + (_nLevel,)
+    _nRatio = np.ones(_shape, np.double)
+    _nRatio[...,1:] = np.cumprod(_rt, axis=-1)
+
+    _nRatio /= _nRatio.sum(axis=-1, keepdims=True)
 
     return _nRatio
 
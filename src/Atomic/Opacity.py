@@ -5,6 +5,7 @@
 ################################################################################
 
 import numpy as np
+import numba as nb
 
 from .. import Constants as Cst
 
@@ -139,20 +140,15 @@ def HIbf_CrossSec1(k,wl):
         6 : (1.0986,-0.00902,  1.367e-4),
         7 : (1.,0., 0.),
     }
+    wl = np.asarray(wl, dtype=np.double)
     wlk = 911.76 * k**2
     ak = 7.93 * k
     wl3 = wl/1000.
     gbf = HIbf_cs_const[k][0] + (HIbf_cs_const[k][1]+HIbf_cs_const[k][2]*wl3)*wl3
-    nwl=len(wl)
-    shibf1=np.zeros(nwl)
 
-    ii=np.where(wl < wlk)[0]
-    if ii.size != 0:
-        shibf1[ii] = ak*(wl[ii]/wlk)**3 *gbf[ii]
-    if nwl == 1:
-        shibf1=shibf1[0]
+    shibf1 = np.where(wl < wlk, ak*(wl/wlk)**3 *gbf, 0.)
 
-    return shibf1
+    return shibf1[()]
 
 ################################################################################
 # HI bound-free CrossSection in LTE per 1 HI atom in unit of e-26 cm^2
@@ -163,8 +159,8 @@ def HIbf_CrossSection(T,wl):
 
     Parameters
     ----------
-    T  : Temperature [K]
-    wl : wavelength [A]
+    T  : Temperature [K], np.double or array-like
+    wl : wavelength [A], np.double or array-like, broadcastable with T
 
     Notes
     -----
@@ -183,42 +179,26 @@ def HIbf_CrossSection(T,wl):
     2019.9.15  K.Ichimoto  from IDL ahic.pro
 """
 
-#    wl = np.asarray(wl)
-#    T = np.asarray(T)
-
-    nwl = n_elements(wl)
-    nt = n_elements(T)
-    if nwl == 1:
-        wl = np.atleast_1d(wl)[0]
-    if nt == 1:
-        T = np.atleast_1d(T)[0]
-    if (nwl > 1) and (nt > 1):
-        print("both T & wl are array! (HIbf_Opacity)")
-#        pdb.set_trace()
+    T = np.asarray(T, dtype=np.double)
+    wl = np.asarray(wl, dtype=np.double)
 
     l0 = np.floor(np.sqrt(wl/911.76)) + 1
     xl = 157779.*(1. - 1./l0**2)/T
     u = 2.0;
     a = (1.-np.exp(-1.438787e8/wl/T))/u
 
-    if nwl > 1:
-        abf = np.zeros(nwl)
-        for k in range(1,7):
-            ii = np.where(l0 == k)[0]
-            if ii.size != 0:
-                for l in range(k,min([k+3,7])+1):
-                    abf[ii]=abf[ii]+(l**2)*np.exp(-xl[ii])*HIbf_CrossSec1(l,wl[ii])*2.e8
-    else:
-        abf = np.zeros(nt)
-        for l in range(l0[0],min([l0[0]+3,7])+1):
-            abf=abf+(l**2)*np.exp(-xl)*HIbf_CrossSec1(l,wl)*2.e8
+    #  level l contributes if l0 <= l <= min(l0+3,7), for l0 = 1,...,6
+    abf = 0.
+    for l in range(1,8):
+        mask = (l0 <= l) & (l <= l0+3) & (l0 <= 6)
+        abf = abf + np.where(mask, (l**2)*np.exp(-xl)*HIbf_CrossSec1(l,wl)*2.e8, 0.)
 
-    if max(l0) > 5:
+    if np.max(l0) > 5:
         print("wl exceeds the limit in 'ahic' !")
 
     abf = a*abf
 
-    return abf
+    return abf[()]
 
 ################################################################################
 # HI free-free CrossSection in LTE per 1 HI atom in unit of e-26 cm^2
@@ -229,8 +209,8 @@ def HIff_CrossSection(T,wl):
 
     Parameters
     ----------
-    T  : Temperature [K]
-    wl : wavelength [A]
+    T  : Temperature [K], np.double or array-like
+    wl : wavelength [A], np.double or array-like, broadcastable with T
 
     Notes
     -----
@@ -253,15 +233,8 @@ def HIff_CrossSection(T,wl):
     2019.9.15  K.Ichimoto  from IDL ahic.pro
 """
 
-    nwl = n_elements(wl)
-    nt = n_elements(T)
-    if nwl == 1:
-        wl = np.atleast_1d(wl)[0]
-    if nt == 1:
-        T = np.atleast_1d(T)[0]
-    if (nwl > 1) and (nt > 1):
-        print("both T & wl are array! (HIff_Opacity)")
-#    assert (nwl > 1) and (nt > 1), "both T & wl are array!"
+    T = np.asarray(T, dtype=np.double)
+    wl = np.asarray(wl, dtype=np.double)
 
     r"""
     ;+/*******************************************************************/
@@ -291,7 +264,7 @@ def HIff_CrossSection(T,wl):
 
     aff = a0*aff
 
-    return aff
+    return aff[()]
 
 ################################################################################
 # H-minus (negative hidrogen) CrossSection per HI atom in unit of e-26 cm^2 (*lte*)
@@ -302,9 +275,10 @@ def Hminus_CrossSection(T,wl,n_e):
 
     Parameters
     ----------
-    T  : Temperature [K]
-    wl : wavelength [A]
-    n_e: electron number density [cm^(-3)]
+    T  : Temperature [K], np.double or array-like
+    wl : wavelength [A], np.double or array-like
+    n_e: electron number density [cm^(-3)], np.double or array-like
+         T, wl and n_e are broadcasted against each other
 
     Notes
     -----
@@ -329,33 +303,19 @@ def Hminus_CrossSection(T,wl,n_e):
     2019.9.15  K.Ichimoto  from IDL ahic.pro
 """
 
-    nwl = n_elements(wl)
-    nt = n_elements(T)
-    if nwl == 1:
-        wl = np.atleast_1d(wl)[0]
-    if nt == 1:
-        T = np.atleast_1d(T)[0]
-    if (nwl > 1) and (nt > 1):
-        print("both T & wl are array! (HIff_Opacity)")
-
+    T = np.asarray(T, dtype=np.double)
+    wl = np.asarray(wl, dtype=np.double)
 
     th = 5039.778/T
     wl3 = wl/1000.
 #;/*  ---   bound-free   ---  */
-    sigm = np.zeros(nwl)
-    ii0 = np.where(wl3 > 16.419)[0] ; count = ii0.size
-    if count != 0:
-        sigm[ii0] = 0.
-    ii1 = np.where( (wl3 < 16.419) & (wl3 > 14.2) )[0] ; count = ii1.size
-#    ii1 = np.where( 14.2 < wl3 < 16.419 )[0] ; count = ii1.size
-    if count != 0:
-        xl = 16.419 - wl3[ii1]
-        sigm[ii1] = (0.269818+(0.220190+(-0.0411288+0.00273236)*xl)*xl)*xl
-    ii2 = np.where(wl3 <= 14.2)[0] ; count = ii2.size
-    if count != 0:
-        sigm[ii2] = 0.00680133 + (0.178708+(0.16479 + (-0.0204842 + 5.95244e-4 * wl3[ii2]) * wl3[ii2]) *wl3[ii2])*wl3[ii2]
-    if n_elements(sigm) == 1:
-        sigm = np.atleast_1d(sigm)[0]
+    #  wl3 >= 16.419 : 0
+    #  14.2 < wl3 < 16.419
+    xl = 16.419 - wl3
+    sigm1 = (0.269818+(0.220190+(-0.0411288+0.00273236)*xl)*xl)*xl
+    #  wl3 <= 14.2
+    sigm2 = 0.00680133 + (0.178708+(0.16479 + (-0.0204842 + 5.95244e-4 * wl3) * wl3) *wl3)*wl3
+    sigm = np.where( wl3 <= 14.2, sigm2, np.where( wl3 < 16.419, sigm1, 0. ) )
     kbf = 0.41590 * th**2.5 * np.exp(1.738*th) * (1.- np.exp(-28.5486*th/wl3)) * sigm
 
 #;/*  ---   free-free   ---  */
@@ -367,7 +327,7 @@ def Hminus_CrossSection(T,wl,n_e):
     ahm = kbf + kff
     pe = 1.38066e-16 * n_e * T
     hmo = ahm*pe
-    return hmo
+    return hmo[()]
 
 
 ################################################################################
@@ -407,11 +367,58 @@ def HIRayleigh_CrossSection(wl):
 """
 
     #w2 = (wl>1026.)**2
-    w2 = (wl.clip(min=1026.))**2
+    w2 = (np.clip(np.asarray(wl, dtype=np.double), 1026., None))**2
     avray1 = 5.799e13/w2**2 + 1.422e20/w2**3 + 2.784/w2**4
-    if n_elements(avray1) == 1:
-          avray1 = np.atleast_1d(avray1)[0]
-    return avray1
+    return avray1[()]
+
+################################################################################
+# H2+ CrossSection table from Carbon & Gingerich (1969)
+#     H2p_e  : photon energy grid, decreasing, [Ryd]
+#     H2p_up, H2p_us, H2p_fr : tabulated coefficients on H2p_e
+################################################################################
+
+H2p_e = np.array(
+      [ 3.0,    2.852,  2.58,   2.294,  2.023,  1.774,
+        1.547,  1.344,  1.165,  1.007,  0.8702, 0.7516,
+        0.6493, 0.5610, 0.4848, 0.4198, 0.3620, 0.3128,
+        0.2702, 0.2332, 0.2011, 0.1732, 0.1491, 0.1281,
+        0.1100, 0.09426,0.0809, 0.06906,0.05874,0.04994,
+        0.04265,0.03635,0.0308, 0.026,  0.02195,0.01864,
+        0.01581,0.01332,0.01118,0.00938,0.00793,0.00669,
+        0.00561,0.00469,0.00392,0.0033 ])
+H2p_up = np.array(
+      [  85.,       9.99465,   4.97842,   3.28472,   2.41452,
+         1.87038,   1.48945,   1.20442,   0.98279,   0.80665,
+         0.66493,   0.54997,   0.45618,   0.37932,   0.31606,
+         0.26382,   0.22057,   0.18446,   0.15473,   0.12977,
+         1.08890e-1,9.14000e-2,7.67600e-2,6.44500e-2,5.41200e-2,
+         4.54000e-2,3.81000e-2,3.19500e-2,2.67600e-2,2.23700e-2,
+         1.86900e-2,1.56100e-2,1.30200e-2,1.08300e-2,8.99000e-3,
+         7.45000e-3,6.15000e-3,5.08000e-3,4.16000e-3,3.42000e-3,
+         2.77000e-3,2.21000e-3,1.78000e-3,1.45000e-3,1.24000e-3,
+         1.14000e-3 ])
+H2p_us = np.array(
+      [ -85.,      -7.1426,   -2.3984,   -0.99032,  -0.39105,
+         -0.09644,  0.05794,   0.13996,   0.18186,   0.20052,
+         0.20525,   0.20167,   0.19309,   0.18167,   0.16871,
+         0.15511,   0.14147,   0.12815,   0.11542,   0.10340,
+         0.09216,   8.18000e-2,7.22900e-2,6.36700e-2,5.58400e-2,
+         4.88400e-2,4.25700e-2,3.69900e-2,3.20700e-2,2.77500e-2,
+         2.39400e-2,2.06100e-2,1.77200e-2,1.52200e-2,1.30500e-2,
+         1.11900e-2,9.58000e-3,8.21000e-3,7.01000e-3,6.00000e-3,
+         5.11000e-3,4.35000e-3,3.72000e-3,3.22000e-3,2.86000e-3,
+         2.63000e-3 ])
+H2p_fr = np.array(
+       [ 0.,      4.30272e-18,1.51111e-17,4.02893e-17,8.89643e-17,
+      1.70250e-16,2.94529e-16,4.77443e-16,7.25449e-16,1.06238e-15,
+      1.50501e-15,2.08046e-15,2.82259e-15,3.76256e-15,4.93692e-15,
+      6.38227e-15,8.17038e-15,1.02794e-14,1.28018e-14,1.57371e-14,
+      1.91217e-14,2.30875e-14,2.75329e-14,3.27526e-14,3.85481e-14,
+      4.52968e-14,5.18592e-14,5.99825e-14,6.92092e-14,7.94023e-14,
+      9.01000e-14,1.01710e-13,1.14868e-13,1.29969e-13,1.46437e-13,
+      1.63042e-13,1.81440e-13,2.02169e-13,2.25126e-13,2.49637e-13,
+      2.73970e-13,3.00895e-13,3.30827e-13,3.64140e-13,3.99503e-13,
+      4.34206e-13 ])
 
 ################################################################################
 # H2+ CrossSection per 1 HI atom and per 1 H+ in unit of e-26 cm^5?
@@ -424,8 +431,8 @@ def avH2p(T,wl):
     ;/*******************************************************************/
     ;  H2+ opacity per 1 HI atom and per 1 H+, scaled by e26
     ;  stimulated emission is corrected
-    ;      T : temperature [K]
-    ;      wl : wave length [A]
+    ;      T : temperature [K], np.double or array-like
+    ;      wl : wave length [A], np.double or array-like, broadcastable with T
     ;  absorption coeff.:
     ;            kh2 = nhi*np*avh2p*1.e-26 (/cm)
 
@@ -441,82 +448,24 @@ def avH2p(T,wl):
     k.ichimoto  19 Feb.1994
     2019.9.11  K.Ichimoto  from IDL avh2p.pro
     """
-    nwl = n_elements(wl)
-    nT = n_elements(T)
-    if nwl == 1:
-        wl = np.atleast_1d(wl)[0]
-    if nT == 1:
-        T = np.atleast_1d(T)[0]
-
-#;/* -----  data from Carbon & Gingerich (1969)  ----- */
-    e = np.array(
-          [ 3.0,    2.852,  2.58,   2.294,  2.023,  1.774,
-            1.547,  1.344,  1.165,  1.007,  0.8702, 0.7516,
-            0.6493, 0.5610, 0.4848, 0.4198, 0.3620, 0.3128,
-            0.2702, 0.2332, 0.2011, 0.1732, 0.1491, 0.1281,
-            0.1100, 0.09426,0.0809, 0.06906,0.05874,0.04994,
-            0.04265,0.03635,0.0308, 0.026,  0.02195,0.01864,
-            0.01581,0.01332,0.01118,0.00938,0.00793,0.00669,
-            0.00561,0.00469,0.00392,0.0033 ])
-    up = np.array(
-          [  85.,       9.99465,   4.97842,   3.28472,   2.41452,
-             1.87038,   1.48945,   1.20442,   0.98279,   0.80665,
-             0.66493,   0.54997,   0.45618,   0.37932,   0.31606,
-             0.26382,   0.22057,   0.18446,   0.15473,   0.12977,
-             1.08890e-1,9.14000e-2,7.67600e-2,6.44500e-2,5.41200e-2,
-             4.54000e-2,3.81000e-2,3.19500e-2,2.67600e-2,2.23700e-2,
-             1.86900e-2,1.56100e-2,1.30200e-2,1.08300e-2,8.99000e-3,
-             7.45000e-3,6.15000e-3,5.08000e-3,4.16000e-3,3.42000e-3,
-             2.77000e-3,2.21000e-3,1.78000e-3,1.45000e-3,1.24000e-3,
-             1.14000e-3 ])
-    us = np.array(
-          [ -85.,      -7.1426,   -2.3984,   -0.99032,  -0.39105,
-             -0.09644,  0.05794,   0.13996,   0.18186,   0.20052,
-             0.20525,   0.20167,   0.19309,   0.18167,   0.16871,
-             0.15511,   0.14147,   0.12815,   0.11542,   0.10340,
-             0.09216,   8.18000e-2,7.22900e-2,6.36700e-2,5.58400e-2,
-             4.88400e-2,4.25700e-2,3.69900e-2,3.20700e-2,2.77500e-2,
-             2.39400e-2,2.06100e-2,1.77200e-2,1.52200e-2,1.30500e-2,
-             1.11900e-2,9.58000e-3,8.21000e-3,7.01000e-3,6.00000e-3,
-             5.11000e-3,4.35000e-3,3.72000e-3,3.22000e-3,2.86000e-3,
-             2.63000e-3 ])
-    fr = np.array(
-           [ 0.,      4.30272e-18,1.51111e-17,4.02893e-17,8.89643e-17,
-          1.70250e-16,2.94529e-16,4.77443e-16,7.25449e-16,1.06238e-15,
-          1.50501e-15,2.08046e-15,2.82259e-15,3.76256e-15,4.93692e-15,
-          6.38227e-15,8.17038e-15,1.02794e-14,1.28018e-14,1.57371e-14,
-          1.91217e-14,2.30875e-14,2.75329e-14,3.27526e-14,3.85481e-14,
-          4.52968e-14,5.18592e-14,5.99825e-14,6.92092e-14,7.94023e-14,
-          9.01000e-14,1.01710e-13,1.14868e-13,1.29969e-13,1.46437e-13,
-          1.63042e-13,1.81440e-13,2.02169e-13,2.25126e-13,2.49637e-13,
-          2.73970e-13,3.00895e-13,3.30827e-13,3.64140e-13,3.99503e-13,
-          4.34206e-13 ])
+    T = np.asarray(T, dtype=np.double)
+    wl = np.asarray(wl, dtype=np.double)
 
     ev = 911.3047/wl
     Tk = 6.3348e-6 * T
 
-    n = np.zeros(nwl, dtype=int)
-    for i in range(0,nwl):
-        #n[i]=min(where(e le ev[i],count))
-        ii = np.where(e <= ev[i])[0] ; count = ii.size
-        if count != 0:
-            n[i] = ii[0]
-        else:
-            n[i]=45
-    d = (ev-e[n])/(e[n+1]-e[n])
-    usq = us[n] + (us[n+1]-us[n])*d
-    upq = up[n] + (up[n+1]-up[n])*d
-    frq = fr[n] + (fr[n+1]-fr[n])*d
-    if nwl == 1:
-        usq=usq[0]
-        upq=upq[0]
-        frq=frq[0]
+    #n[i]=min(where(e le ev[i],count))
+    #  H2p_e is decreasing, so the number of e > ev is the first index with e <= ev.
+    #  ev below the table is extrapolated from the last bin.
+    n = np.searchsorted(-H2p_e, -ev, side="left")
+    n = np.minimum(n, H2p_e.size-2)
+    d = (ev-H2p_e[n])/(H2p_e[n+1]-H2p_e[n])
+    usq = H2p_us[n] + (H2p_us[n+1]-H2p_us[n])*d
+    upq = H2p_up[n] + (H2p_up[n+1]-H2p_up[n])*d
+    frq = H2p_fr[n] + (H2p_fr[n+1]-H2p_fr[n])*d
     avh2p1 = abs( frq * ( np.exp(usq/Tk) - np.exp(-upq/Tk) ) )
 
-    if n_elements(avh2p1) == 1:
-        avh2p1=avh2p1[0]
-
-    return avh2p1
+    return avh2p1[()]
 
 ################################################################################
 # H2+ CrossSection per 1 HI atom n unit of e-26 cm^2 in LTE
@@ -527,10 +476,11 @@ def H2p_CrossSection(T,wl,n_e,n_H):
 
     Parameters
     ----------
-    T  : Temperature [K]
-    wl : wavelength [A]
-    n_e: electron number density [cm^(-3)]
-    n_H: hydrogen number density [cm^(-3)]
+    T  : Temperature [K], np.double or array-like
+    wl : wavelength [A], np.double or array-like
+    n_e: electron number density [cm^(-3)], np.double or array-like
+    n_H: hydrogen number density [cm^(-3)], np.double or array-like
+         T, wl, n_e and n_H are broadcasted against each other
 
     Notes
     -----
@@ -547,9 +497,9 @@ def H2p_CrossSection(T,wl,n_e,n_H):
 
     #;/*  -----   solving LTE Saha's eq. for hydrogen   -----	*/
     q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
-    np  = 1.0/(q+1.0)*n_H
+    n_p  = 1.0/(q+1.0)*n_H
 
-    return np*avH2p(T,wl)
+    return n_p*avH2p(T,wl)
 
 ################################################################################
 # LTE continuum opacity in cm-1
@@ -561,10 +511,17 @@ def xclte(T,n_H,n_e,wl):
 
     Parameters
     ----------
-    T  : Temperature [K]
-    n_H: H atom number density [cm^(-3)]
-    n_e: electron number density [cm^(-3)]
-    wl : wavelength [A]
+    T  : Temperature [K], np.double or array-like
+    n_H: H atom number density [cm^(-3)], np.double or array-like
+    n_e: electron number density [cm^(-3)], np.double or array-like
+    wl : wavelength [A], np.double or array-like
+
+    Returns
+    -------
+    xclte : opacity [cm^(-1)], np.double or array-like
+         T, n_H, n_e and wl are broadcasted against each other,
+         e.g. T[:,None], n_H[:,None], n_e[:,None] and wl[None,:] for
+         a (depth, wavelength) opacity block
 
     Notes
     -----
@@ -588,18 +545,10 @@ def xclte(T,n_H,n_e,wl):
     k.ichimoto  19 Feb.1994
     2019.9.15  K.Ichimoto  from IDL avray.pro
 """
-    nwl = n_elements(wl)
-    nT  = n_elements(T)
-    nnH = n_elements(n_H)
-    nne = n_elements(n_e)
-    if nwl == 1:
-        wl = np.atleast_1d(wl)[0]
-    if nT == 1:
-        T = np.atleast_1d(T)[0]
-    if nnH == 1:
-        n_H = np.atleast_1d(n_H)[0]
-    if nne == 1:
-        n_e = np.atleast_1d(n_e)[0]
+    T = np.asarray(T, dtype=np.double)
+    n_H = np.asarray(n_H, dtype=np.double)
+    n_e = np.asarray(n_e, dtype=np.double)
+    wl = np.asarray(wl, dtype=np.double)
 
 #;/*  -----   solving LTE Saha's eq. for hydrogen   -----	*/
     q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
@@ -609,3 +558,160 @@ def xclte(T,n_H,n_e,wl):
               + H2p_CrossSection(T,wl,n_e,n_H) + HIRayleigh_CrossSection(wl) ) * 1.e-26
 
     return xclte
+
+################################################################################
+# scalar kernels of the continuum opacities above, without `n_elements`,
+# `np.atleast_1d` and `np.where` branching, to be compiled as ufuncs.
+#
+# `*_ufunc(...)` functions are not vectorized functions, only available to
+# scalar operation. so we applied
+#
+# `nb.vectorize( [nb.float64(nb.float64, ...)], nopython=True)`.
+################################################################################
+
+HIbf_cs_const_ = np.array([
+        (0., 0., 0.),
+        (0.9916, 9.068e-3, -0.2524),
+        (1.105, -7.922e-2, 4.536e-3),
+        (1.101, -3.290e-2, 1.152e-3),
+        (1.101, -1.923e-2, 5.110e-4),
+        (1.102, -0.01304,  2.638e-4),
+        (1.0986,-0.00902,  1.367e-4),
+        (1.,0., 0.),
+    ], dtype=np.double)
+"""coefficients of b-f gaunt factor of HI level k = 1,...,7, same as in `HIbf_CrossSec1`
+"""
+
+def HIbf_CrossSec1_ufunc(k, wl):
+    r"""
+    scalar kernel of `HIbf_CrossSec1`, k = 1,...,7
+    """
+    wlk = 911.76 * k**2
+    if wl >= wlk:
+        return 0.
+    ak = 7.93 * k
+    wl3 = wl/1000.
+    gbf = HIbf_cs_const_[k,0] + (HIbf_cs_const_[k,1]+HIbf_cs_const_[k,2]*wl3)*wl3
+
+    return ak*(wl/wlk)**3 *gbf
+
+def HIbf_CrossSection_ufunc(T, wl):
+    r"""
+    scalar kernel of `HIbf_CrossSection`, without the warning of wl exceeding the limit
+    """
+    l0 = np.floor(np.sqrt(wl/911.76)) + 1
+    xl = 157779.*(1. - 1./l0**2)/T
+    u = 2.0
+    a = (1.-np.exp(-1.438787e8/wl/T))/u
+
+    abf = 0.
+    if l0 <= 6:
+        for l in range(int(l0), min(int(l0)+3,7)+1):
+            abf = abf + (l**2)*np.exp(-xl)*HIbf_CrossSec1_ufunc(l,wl)*2.e8
+
+    return a*abf
+
+def HIff_CrossSection_ufunc(T, wl):
+    r"""
+    scalar kernel of `HIff_CrossSection`
+    """
+    a = 1.0828 + 3.865e-6 * T
+    b = 7.564e-7 + (4.920e-10 - 2.482e-15 *T)*T
+    c = 5.326e-12 + (-3.904e-15 + 1.8790e-20 *T)*T
+    gff = a+(b+c*wl)*wl
+    ahiff = 9.9264e-6* T**(-1.5) * wl**3 *gff
+
+    xi = 157779./T
+    u = 2.0
+    a0 = (1.-np.exp(-1.438787e8/wl/T))/u
+    aff = 0.66699*T**2.5 *np.exp(-xi)*ahiff
+
+    return a0*aff
+
+def Hminus_CrossSection_ufunc(T, wl, n_e):
+    r"""
+    scalar kernel of `Hminus_CrossSection`
+    """
+    th = 5039.778/T
+    wl3 = wl/1000.
+#;/*  ---   bound-free   ---  */
+    if wl3 <= 14.2:
+        sigm = 0.00680133 + (0.178708+(0.16479 + (-0.0204842 + 5.95244e-4 * wl3) * wl3) *wl3)*wl3
+    elif wl3 < 16.419:
+        xl = 16.419 - wl3
+        sigm = (0.269818+(0.220190+(-0.0411288+0.00273236)*xl)*xl)*xl
+    else:
+        sigm = 0.
+    kbf = 0.41590 * th**2.5 * np.exp(1.738*th) * (1.- np.exp(-28.5486*th/wl3)) * sigm
+
+#;/*  ---   free-free   ---  */
+    a = 0.005366+(-0.011493+0.027039*th)*th
+    b = -3.2062+(11.924-5.939*th)*th
+    c = -0.40192+(7.0355-0.34592*th)*th
+    kff = a + (b+c*wl3)*wl3/1000.
+
+    ahm = kbf + kff
+    pe = 1.38066e-16 * n_e * T
+
+    return ahm*pe
+
+def HIRayleigh_CrossSection_ufunc(wl):
+    r"""
+    scalar kernel of `HIRayleigh_CrossSection`
+    """
+    w2 = max(wl, 1026.)**2
+
+    return 5.799e13/w2**2 + 1.422e20/w2**3 + 2.784/w2**4
+
+def avH2p_ufunc(T, wl):
+    r"""
+    scalar kernel of `avH2p`
+    """
+    ev = 911.3047/wl
+    Tk = 6.3348e-6 * T
+
+    #  first index with H2p_e <= ev, H2p_e is decreasing
+    n = H2p_e.size-2
+    for i in range(H2p_e.size-2):
+        if H2p_e[i] <= ev:
+            n = i
+            break
+    d = (ev-H2p_e[n])/(H2p_e[n+1]-H2p_e[n])
+    usq = H2p_us[n] + (H2p_us[n+1]-H2p_us[n])*d
+    upq = H2p_up[n] + (H2p_up[n+1]-H2p_up[n])*d
+    frq = H2p_fr[n] + (H2p_fr[n+1]-H2p_fr[n])*d
+
+    return abs( frq * ( np.exp(usq/Tk) - np.exp(-upq/Tk) ) )
+
+def H2p_CrossSection_ufunc(T, wl, n_e, n_H):
+    r"""
+    scalar kernel of `H2p_CrossSection`
+    """
+    q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
+    n_p  = 1.0/(q+1.0)*n_H
+
+    return n_p*avH2p_ufunc(T,wl)
+
+def xclte_ufunc(T, n_H, n_e, wl):
+    r"""
+    scalar kernel of `xclte`, LTE continuum opacity in cm-1
+    """
+    q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
+    nHI =  q /(q+1.0)*n_H
+
+    return nHI * ( HIbf_CrossSection_ufunc(T,wl) + HIff_CrossSection_ufunc(T,wl) + Hminus_CrossSection_ufunc(T,wl,n_e)
+              + H2p_CrossSection_ufunc(T,wl,n_e,n_H) + HIRayleigh_CrossSection_ufunc(wl) ) * 1.e-26
+
+################################################################################
+# whether to compile them using numba's LLVM
+################################################################################
+
+if Cst.isJIT == True :
+    HIbf_CrossSec1_ufunc = nb.njit( [nb.float64(nb.int64, nb.float64)] )( HIbf_CrossSec1_ufunc )
+    HIbf_CrossSection_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64)], nopython=True)( HIbf_CrossSection_ufunc )
+    HIff_CrossSection_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64)], nopython=True)( HIff_CrossSection_ufunc )
+    Hminus_CrossSection_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64,nb.float64)], nopython=True)( Hminus_CrossSection_ufunc )
+    HIRayleigh_CrossSection_ufunc = nb.vectorize( [nb.float64(nb.float64)], nopython=True)( HIRayleigh_CrossSection_ufunc )
+    avH2p_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64)], nopython=True)( avH2p_ufunc )
+    H2p_CrossSection_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64,nb.float64,nb.float64)], nopython=True)( H2p_CrossSection_ufunc )
+    xclte_ufunc = nb.vectorize( [nb.float64(nb.float64,nb.float64,nb.float64,nb.float64)], nopython=True)( xclte_ufunc )
@@ -0,0 +1,277 @@
+################################################################################
+# this file defines a table of LTE continuum opacity sources
+#     precomputed on a (log10 T, wavelength) grid by functions in Opacity.py,
+#     for repeated evaluations with the same wavelength grid
+################################################################################
+
+import os
+import warnings
+
+import numpy as np
+
+from . import Opacity
+from ..Math import Interpolate
+
+################################################################################
+# smallest cross section kept in the table, to take logarithm of zeros
+################################################################################
+
+tiny_ = 1.E-300
+
+################################################################################
+# electron density giving an electron pressure pe = 1 [dyne/cm^2]
+################################################################################
+
+def ne_unit_pe(T):
+    r"""
+    return the electron density [cm^(-3)] with which pe = n_e k T = 1 [dyne/cm^2]
+
+    Parameters
+    ----------
+    T  : Temperature [K]
+    """
+    return 1. / (1.38066e-16 * T)
+
+class OpacityTable:
+
+    def __init__(self, _path, _wl=None, _logT=None, _overwrite=False):
+        r"""
+        initial method of class OpacityTable.
+
+        Parameters
+        ----------
+
+        _path : str
+            path to the table file *.npz.
+            read it if it exists, otherwise compute the table and save it to `_path`.
+
+        _wl : np.double, np.array, (nwl,)
+            wavelength [A], default: None, the grid stored in `_path`
+
+        _logT : np.double, np.array, (nT,)
+            sorted log10 temperature [K] grid,
+            default: None, the grid stored in `_path` or 3.5 to 4.5 with step 0.005
+
+        _overwrite : bool
+            if the grid stored in `_path` differs from a given `_wl` or `_logT`,
+            recompute the table and overwrite `_path` when True, raise ValueError when False.
+            default: False
+
+        Notes
+        -----
+
+        Electron pressure enters H- opacity as a factor pe and H2+ opacity through
+        the number density of protons, both are applied analytically in `xclte`.
+        Therefore only cross sections depending on (T, wl) are tabulated,
+        their logarithm is linearly interpolated in log10 T.
+        """
+        self.path = _path
+
+        if os.path.isfile(_path):
+            self.read(_path)
+            _same_wl = _wl is None or np.array_equal(self.wl, _wl)
+            _same_logT = _logT is None or np.array_equal(self.logT, _logT)
+            if _same_wl and _same_logT:
+                return
+            if not _overwrite:
+                raise ValueError("grid of {} differs from the given {}, "
+                                 "use _overwrite=True to recompute it.".format(
+                                 _path, "_wl" if not _same_wl else "_logT"))
+            #--- keep the stored grid where no new one is given
+            if _wl is None:
+                _wl = self.wl
+            if _logT is None:
+                _logT = self.logT
+
+        if _wl is None:
+            raise ValueError("_wl is required to compute a new opacity table.")
+        if _logT is None:
+            _logT = np.arange(3.5, 4.5+1.E-9, 0.005)
+
+        self.make(_wl, _logT)
+        self.save(_path)
+
+    def make(self, _wl, _logT):
+        r"""
+        compute each continuum source on the (log10 T, wavelength) grid.
+
+        Parameters
+        ----------
+
+        _wl : np.double, np.array, (nwl,)
+            wavelength [A]
+
+        _logT : np.double, np.array, (nT,)
+            log10 temperature [K]
+        """
+        self.wl = np.asarray(_wl, dtype=np.double)
+        self.logT = np.asarray(_logT, dtype=np.double)
+
+        T = 10.**self.logT[:,None]
+        wl = self.wl[None,:]
+
+        #--- cross section per HI atom in unit of e-26 cm^2
+        self.log_HIbf = np.log( np.maximum( Opacity.HIbf_CrossSection(T,wl), tiny_ ) )
+        self.log_HIff = np.log( np.maximum( Opacity.HIff_CrossSection(T,wl), tiny_ ) )
+        #--- H- cross section per HI atom and unit pe
+        self.log_Hminus = np.log( np.maximum( Opacity.Hminus_CrossSection(T,wl,ne_unit_pe(T)), tiny_ ) )
+        #--- H2+ cross section per HI atom and per H+
+        self.log_H2p = np.log( np.maximum( Opacity.avH2p(T,wl), tiny_ ) )
+        #--- Rayleigh scattering, independent of T
+        self.HIRayleigh = Opacity.HIRayleigh_CrossSection(self.wl)
+
+    def save(self, _path):
+        r"""
+        save the table to *.npz
+
+        Parameters
+        ----------
+
+        _path : str
+            path to the table file *.npz
+        """
+        with open(_path, 'wb') as file:
+            np.savez(file, wl=self.wl, logT=self.logT, log_HIbf=self.log_HIbf, log_HIff=self.log_HIff,
+                     log_Hminus=self.log_Hminus, log_H2p=self.log_H2p, HIRayleigh=self.HIRayleigh)
+
+    def read(self, _path):
+        r"""
+        read the table from *.npz
+
+        Parameters
+        ----------
+
+        _path : str
+            path to the table file *.npz
+        """
+        with np.load(_path) as _data:
+            self.wl = _data["wl"]
+            self.logT = _data["logT"]
+            self.log_HIbf = _data["log_HIbf"]
+            self.log_HIff = _data["log_HIff"]
+            self.log_Hminus = _data["log_Hminus"]
+            self.log_H2p = _data["log_H2p"]
+            self.HIRayleigh = _data["HIRayleigh"]
+
+    def interpolate(self, T):
+        r"""
+        interpolate the tabulated cross sections at temperature T.
+
+        Parameters
+        ----------
+
+        T : np.double or array-like, (...)
+            Temperature [K], clipped into the table with a RuntimeWarning
+
+        Returns
+        -------
+
+        sources : dict of np.array, (..., nwl)
+            "HIbf", "HIff" : per HI atom in unit of e-26 cm^2
+            "Hminus" : per HI atom and unit pe in unit of e-26 cm^2
+            "H2p" : per HI atom and per H+ in unit of e-26 cm^5
+        """
+        logT = np.log10(T)
+        if np.any(logT < self.logT[0]) or np.any(logT > self.logT[-1]):
+            warnings.warn("T out of the table range [{:.4g}, {:.4g}] K, clipped.".format(
+                          10.**self.logT[0], 10.**self.logT[-1]), RuntimeWarning, stacklevel=2)
+
+        i, t = Interpolate.locate_grid(self.logT, logT)
+        t = t[...,None]
+
+        sources = {}
+        for key in ("HIbf", "HIff", "Hminus", "H2p"):
+            table = getattr(self, "log_" + key)
+            sources[key] = np.exp( (1.-t) * table[i,:] + t * table[i+1,:] )
+
+        return sources
+
+    def xclte(self, T, n_H, n_e, _sources=False):
+        r"""
+        LTE continuum opacity in cm-1 on the wavelength grid of the table,
+        same as `Opacity.xclte(T[...,None], n_H[...,None], n_e[...,None], self.wl)`.
+
+        Parameters
+        ----------
+
+        T  : Temperature [K], np.double or array-like, (...)
+        n_H: H atom number density [cm^(-3)], np.double or array-like, (...)
+        n_e: electron number density [cm^(-3)], np.double or array-like, (...)
+        _sources : bool, whether to also return the opacity of each source, default: False
+
+        Returns
+        -------
+        xclte : opacity [cm^(-1)], np.array, (..., nwl)
+
+        kappa : dict of np.array, (..., nwl), opacity of each source [cm^(-1)],
+                only if `_sources` is True
+        """
+        T = np.asarray(T, dtype=np.double)[...,None]
+        n_H = np.asarray(n_H, dtype=np.double)[...,None]
+        n_e = np.asarray(n_e, dtype=np.double)[...,None]
+
+        sources = self.interpolate(T[...,0])
+
+#;/*  -----   solving LTE Saha's eq. for hydrogen   -----	*/
+        q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
+        nHI =  q /(q+1.0)*n_H
+        n_p = 1.0/(q+1.0)*n_H
+        pe = 1.38066e-16 * n_e*T
+
+        kappa = {
+            "HIbf" : nHI * sources["HIbf"] * 1.e-26,
+            "HIff" : nHI * sources["HIff"] * 1.e-26,
+            "Hminus" : nHI * pe * sources["Hminus"] * 1.e-26,
+            "H2p" : nHI * n_p * sources["H2p"] * 1.e-26,
+            "HIRayleigh" : nHI * self.HIRayleigh * 1.e-26,
+        }
+        xclte = kappa["HIbf"] + kappa["HIff"] + kappa["Hminus"] + kappa["H2p"] + kappa["HIRayleigh"]
+
+        if _sources:
+            return xclte, kappa
+        return xclte
+
+    def check(self, T, n_H, n_e):
+        r"""
+        accuracy check of the table against the direct formulas in Opacity.py.
+
+        Parameters
+        ----------
+
+        T  : Temperature [K], np.double or array-like, (...)
+        n_H: H atom number density [cm^(-3)], np.double or array-like, (...)
+        n_e: electron number density [cm^(-3)], np.double or array-like, (...)
+
+        Returns
+        -------
+        err : dict of np.double
+            maximum relative error of the total opacity ("xclte"),
+            and maximum error of each source relative to the total opacity
+        """
+        T = np.asarray(T, dtype=np.double)
+        n_H = np.asarray(n_H, dtype=np.double)
+        n_e = np.asarray(n_e, dtype=np.double)
+
+        xclte, kappa = self.xclte(T, n_H, n_e, _sources=True)
+
+        T = T[...,None]
+        n_H = n_H[...,None]
+        n_e = n_e[...,None]
+        wl = self.wl
+
+        q = 2.0*2.07e-16 * T**(-1.5) * 10.**(5040.*13.6/T) * n_e
+        nHI =  q /(q+1.0)*n_H
+        kappa_direct = {
+            "HIbf" : nHI * Opacity.HIbf_CrossSection(T,wl) * 1.e-26,
+            "HIff" : nHI * Opacity.HIff_CrossSection(T,wl) * 1.e-26,
+            "Hminus" : nHI * Opacity.Hminus_CrossSection(T,wl,n_e) * 1.e-26,
+            "H2p" : nHI * Opacity.H2p_CrossSection(T,wl,n_e,n_H) * 1.e-26,
+            "HIRayleigh" : nHI * Opacity.HIRayleigh_CrossSection(wl) * 1.e-26,
+        }
+        xclte_direct = Opacity.xclte(T, n_H, n_e, wl)
+
+        err = { "xclte" : np.max( np.abs(xclte - xclte_direct) / xclte_direct ) }
+        for key in kappa.keys():
+            err[key] = np.max( np.abs(kappa[key] - kappa_direct[key]) / xclte_direct )
+
+        return err
@@ -1,6 +1,16 @@
 import numpy as np
 
 
+def is_unique_pair(_idxI, _idxJ, _nLevel):
+    r"""
+    whether every (i,j) pair appears only once in `_idxI`, `_idxJ`,
+    required by the fancy-index scatter of `setMatrixC` and `setMatrixR`.
+    """
+    _key = np.asarray(_idxI, dtype=np.intp) * _nLevel + np.asarray(_idxJ, dtype=np.intp)
+
+    return np.unique(_key).size == _key.size
+
+
 def setMatrixC(_Cmat, _Cji, _Cij, _idxI, _idxJ, _Ne):
     r"""
     Compute the collisional rate matrix.
@@ -8,13 +18,13 @@ def setMatrixC(_Cmat, _Cji, _Cij, _idxI, _idxJ, _Ne):
     Parameters
     ----------
 
-    _Cmat : numpy.2darray of np.double
-        collisional rate matrix, a 2D Array to store computed results, [:math:`s^{-1}`]
+    _Cmat : np.double, np.array, (..., nLevel,nLevel)
+        collisional rate matrix, an Array to store computed results, [:math:`s^{-1}`]
 
-    _Cji : numpy.1darray of np.double
+    _Cji : np.double, np.array, (..., nTran)
         downward collisional transition rate, [:math:`s^{-1} \cdot cm^{3}`]
 
-    _Cij : numpy.1darray of np.double
+    _Cij : np.double, np.array, (..., nTran)
         upward collisional transition rate, [:math:`s^{-1} \cdot cm^{3}`]
 
     _idxI : numpy.1darray of np.uint16
@@ -23,11 +33,15 @@ def setMatrixC(_Cmat, _Cji, _Cij, _idxI, _idxJ, _Ne):
     _idxJ : numpy.1darray of np.uint16
         level index of upper level j, [-]
 
-    _Ne: np.double
+    _Ne: np.double or np.array, (...)
         electron density, [:math:`cm^{-3}`]
 
     Notes
     -----
+    All transitions are scattered into `_Cmat` at once,
+    the leading axes (...) stand for a batch of grid points.
+    Each (i,j) pair should appear only once in `_idxI`, `_idxJ`, which is asserted.
+
     Refer to [1]_ Equation(9.80).
 
     .. math:: \sum_{j \neq i} n_j (R_{ji}+n_{e} C_{ji}) - n_i \sum_{j \neq i}(R_{ij}+n_{e} C_{ij}) = 0
@@ -43,14 +57,13 @@ def setMatrixC(_Cmat, _Cji, _Cij, _idxI, _idxJ, _Ne):
 
     """
 
-    _n_row, _n_col = _Cmat.shape
+    _n_row, _n_col = _Cmat.shape[-2:]
     assert _n_row == _n_col, '_Cmat should be a squared matrix.'
+    assert is_unique_pair(_idxI, _idxJ, _n_row), 'duplicated (i,j) pairs in _idxI, _idxJ.'
 
-    _nTran = _Cji.size
-    for k in range(_nTran):
-        i, j = _idxI[k], _idxJ[k]
-        _Cmat[i,j] += _Ne * _Cji[k]
-        _Cmat[j,i] += _Ne * _Cij[k]
+    _Ne = np.asarray(_Ne, dtype=np.double)[...,None]
+    _Cmat[...,_idxI,_idxJ] += _Ne * _Cji
+    _Cmat[...,_idxJ,_idxI] += _Ne * _Cij
 
 
 def setMatrixR(_Rmat, _Rji_spon, _Rji_stim, _Rij, _idxI, _idxJ):
@@ -60,16 +73,16 @@ def setMatrixR(_Rmat, _Rji_spon, _Rji_stim, _Rij, _idxI, _idxJ):
     Parameters
     ----------
 
-    _Rmat : numpy.2darray of np.double
-        radiative rate matrix, a 2D Array to store computed results, [:math:`s^{-1}`]
+    _Rmat : np.double, np.array, (..., nLevel,nLevel)
+        radiative rate matrix, an Array to store computed results, [:math:`s^{-1}`]
 
-    _Rji_spon : numpy.1darray of np.double
+    _Rji_spon : np.double, np.array, (..., nTran)
         spontaneous radiative transition rate, [:math:`s^{-1}`]
 
-    _Rji_stim : numpy.1darray of np.double
-        spontaneous radiative transition rate, [:math:`s^{-1}`]
+    _Rji_stim : np.double, np.array, (..., nTran)
+        stimulated radiative transition rate, [:math:`s^{-1}`]
 
-    _Rij : numpy.1darray of np.double
+    _Rij : np.double, np.array, (..., nTran)
         upward radiative transition rate, [:math:`s^{-1}`]
 
     _idxI : numpy.1darray of np.uint16
@@ -80,6 +93,10 @@ def setMatrixR(_Rmat, _Rji_spon, _Rji_stim, _Rij, _idxI, _idxJ):
 
     Notes
     -----
+    All transitions are scattered into `_Rmat` at once,
+    the leading axes (...) stand for a batch of grid points.
+    Each (i,j) pair should appear only once in `_idxI`, `_idxJ`, which is asserted.
+
     Refer to [1]_ Equation(9.80).
 
     .. math:: \sum_{j \neq i} n_j (R_{ji}+C_{ji}) - n_i \sum_{j \neq i}(R_{ij}+C_{ij}) = 0
@@ -94,14 +111,12 @@ def setMatrixR(_Rmat, _Rji_spon, _Rji_stim, _Rij, _idxI, _idxJ):
         Princeton University Press, pp. 282, 2015.
 
     """
-    _n_row, _n_col = _Rmat.shape
+    _n_row, _n_col = _Rmat.shape[-2:]
     assert _n_row == _n_col, '_Rmat should be a squared matrix.'
+    assert is_unique_pair(_idxI, _idxJ, _n_row), 'duplicated (i,j) pairs in _idxI, _idxJ.'
 
-    _nTran = _Rji_spon.size
-    for k in range(_nTran):
-        i, j = _idxI[k], _idxJ[k]
-        _Rmat[i,j] += _Rji_spon[k] + _Rji_stim[k]
-        _Rmat[j,i] += _Rij[k]
+    _Rmat[...,_idxI,_idxJ] += _Rji_spon + _Rji_stim
+    _Rmat[...,_idxJ,_idxI] += _Rij
 
 
 def solveSE(_Rmat, _Cmat):
@@ -144,3 +159,190 @@ def solveSE(_Rmat, _Cmat):
     _nArr = np.linalg.solve(_A,_b)
 
     return _nArr
+
+
+def solveSE_batch(_Rmat, _Cmat):
+    r"""
+    solve the linear equation systems of statistical equilibrium
+    for a stack of grid points in one vectorized call.
+
+    Parameters
+    ----------
+
+    _Rmat : np.double, np.array, (..., nLevel,nLevel)
+        radiative transition rate matrices, [:math:`s^{-1}`]
+
+    _Cmat : np.double, np.array, (..., nLevel,nLevel)
+        collisional transition rate matrices, [:math:`s^{-1}`]
+
+    Returns
+    -------
+
+    _nArr : np.double, np.array, (..., nLevel)
+        normalized level population. [:math:`cm^{-3}`]
+
+    Notes
+    -----
+    Equivalent to calling `solveSE` for each grid point,
+    the leading axes of `_Rmat` and `_Cmat` are broadcasted against each other.
+
+    """
+
+    _A = _Cmat + _Rmat
+    _shape = _A.shape[:-1]
+    _nLevel = _A.shape[-1]
+    _A = _A.reshape(-1, _nLevel, _nLevel)
+    _nPoint = _A.shape[0]
+
+    #-------------------------------------------------------------
+    # diagnal components
+    #-------------------------------------------------------------
+    _idx = np.arange(_nLevel)
+    _A[:,_idx,_idx] = - _A.sum(axis=1)
+
+    #-------------------------------------------------------------
+    # abundance definition equation
+    #-------------------------------------------------------------
+    _A[:,-1,:] = 1.
+    _b = np.zeros((_nPoint,_nLevel,1), dtype=np.double)
+    _b[:,-1,0] = 1.
+
+    _nArr = np.linalg.solve(_A,_b)[:,:,0]
+
+    return _nArr.reshape(_shape)
+
+
+################################################################################
+# sparse rate matrices
+#    - a stack of grid points is stored as one block diagonal CSR matrix
+################################################################################
+
+def setMatrix_csr(_nLevel, _Rji, _Rij, _idxI, _idxJ):
+    r"""
+    assemble the rate matrix of a stack of grid points in CSR format.
+
+    Parameters
+    ----------
+
+    _nLevel : int
+        number of levels
+
+    _Rji : np.double, np.array, (..., nTran)
+        total downward transition rate, e.g. :math:`R_{ji} + n_e C_{ji}`, [:math:`s^{-1}`]
+
+    _Rij : np.double, np.array, (..., nTran)
+        total upward transition rate, e.g. :math:`R_{ij} + n_e C_{ij}`, [:math:`s^{-1}`]
+
+    _idxI : numpy.1darray of np.uint16
+        level index of lower level i, [-]
+
+    _idxJ : numpy.1darray of np.uint16
+        level index of upper level j, [-]
+
+    Returns
+    -------
+
+    _Amat : scipy.sparse.csr_matrix, (nPoint*nLevel, nPoint*nLevel)
+        block diagonal rate matrix, block p is `_Rmat + _Cmat` of grid point p
+        without diagonal components, [:math:`s^{-1}`]
+
+    Notes
+    -----
+    Radiative and collisional transitions may have different index arrays,
+    concatenate them before calling, duplicated entries are summed.
+    The number of stored elements is 2 * nPoint * nTran.
+    """
+    from scipy import sparse
+
+    _Rji = np.asarray(_Rji, dtype=np.double)
+    _Rij = np.asarray(_Rij, dtype=np.double)
+    _nTran = _idxI.size
+    _Rji = np.broadcast_to(_Rji, np.broadcast(_Rji, _Rij).shape).reshape(-1, _nTran)
+    _Rij = np.broadcast_to(_Rij, _Rji.shape).reshape(-1, _nTran)
+    _nPoint = _Rji.shape[0]
+
+    _offset = ( np.arange(_nPoint) * _nLevel )[:,None]
+    _I = ( _idxI.astype(np.intp) + _offset ).ravel()
+    _J = ( _idxJ.astype(np.intp) + _offset ).ravel()
+
+    _rows = np.concatenate( (_I, _J) )
+    _cols = np.concatenate( (_J, _I) )
+    _data = np.concatenate( (_Rji.ravel(), _Rij.ravel()) )
+    _N = _nPoint * _nLevel
+
+    return sparse.csr_matrix( (_data, (_rows, _cols)), shape=(_N, _N) )
+
+
+def solveSE_sparse(_Amat, _nLevel, _method="lu", _tol=1.E-10):
+    r"""
+    solve the linear equation systems of statistical equilibrium
+    of a stack of grid points with a sparse solver.
+
+    Parameters
+    ----------
+
+    _Amat : scipy.sparse matrix, (nPoint*nLevel, nPoint*nLevel)
+        block diagonal rate matrix from `setMatrix_csr`, [:math:`s^{-1}`]
+
+    _nLevel : int
+        number of levels
+
+    _method : str
+        "lu" : sparse LU decomposition (SuperLU),
+        "gmres", "bicgstab" : iterative solver preconditioned by incomplete LU,
+        default: "lu"
+
+    _tol : np.double
+        relative tolerance of iterative solvers, default: 1E-10
+
+    Returns
+    -------
+
+    _nArr : np.double, np.array, (nPoint, nLevel)
+        normalized level population. [:math:`cm^{-3}`]
+
+    Notes
+    -----
+    Same equations as `solveSE_batch`: diagonal components are minus the column sums,
+    and the last row of each block is replaced by the abundance definition equation.
+    """
+    import scipy
+    from scipy import sparse
+    from scipy.sparse import linalg
+
+    _N = _Amat.shape[0]
+    _nPoint = _N // _nLevel
+
+    #-------------------------------------------------------------
+    # diagnal components
+    #-------------------------------------------------------------
+    _colsum = np.asarray( _Amat.sum(axis=0) ).ravel()
+    _A = sparse.csr_matrix(_Amat) - sparse.diags(_colsum)
+
+    #-------------------------------------------------------------
+    # abundance definition equation
+    #-------------------------------------------------------------
+    _last = np.arange(_nPoint) * _nLevel + _nLevel - 1
+    _keep = np.ones(_N, dtype=np.double)
+    _keep[_last] = 0.
+    _ones = sparse.csr_matrix( (np.ones(_N), (np.repeat(_last, _nLevel), np.arange(_N))), shape=(_N, _N) )
+    _A = ( sparse.diags(_keep) @ _A + _ones ).tocsc()
+
+    _b = np.zeros(_N, dtype=np.double)
+    _b[_last] = 1.
+
+    if _method == "lu":
+        _nArr = linalg.splu(_A).solve(_b)
+    elif _method in ("gmres", "bicgstab"):
+        _M = linalg.LinearOperator( _A.shape, linalg.spilu(_A).solve )
+        _solver = linalg.gmres if _method == "gmres" else linalg.bicgstab
+        #--- `tol` was renamed to `rtol` in scipy 1.12
+        _version = tuple( int(v) for v in scipy.__version__.split(".")[:2] )
+        _key = "rtol" if _version >= (1, 12) else "tol"
+        _nArr, _info = _solver(_A, _b, M=_M, **{ _key : _tol })
+        if _info != 0:
+            raise RuntimeError("{} did not converge, info = {}".format(_method, _info))
+    else:
+        raise ValueError("_method should be one of 'lu', 'gmres' and 'bicgstab'.")
+
+    return _nArr.reshape(_nPoint, _nLevel)
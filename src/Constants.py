@@ -70,3 +70,15 @@ set to
     True  : before simulation; before pushing to github
     False : before generating documentation using sphinx
 """
+
+isParallel = False
+"""whether numba ufuncs for large arrays (e.g. `Profile.Voigt`, `Profile.Gaussian`)
+are compiled with the multithreaded "parallel" target, only works if isJIT is True.
+
+set to
+    True  : to compute large (nDepth, nLine, nFreq) arrays across all cores
+    False : for small arrays, where the thread overhead dominates
+
+the number of threads is controlled at runtime by `numba.set_num_threads`
+or the environment variable NUMBA_NUM_THREADS.
+"""
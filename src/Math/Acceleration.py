@@ -0,0 +1,289 @@
+################################################################################
+# this file defines functions for
+#     convergence acceleration of fixed-point iterations
+################################################################################
+
+import numpy as np
+
+
+################################################################################
+# Ng acceleration
+################################################################################
+
+def Ng_extrapolate(_X, _order=2):
+    r"""
+    Ng acceleration of a sequence of iterates.
+
+    Parameters
+    ----------
+
+    _X : list of np.double, np.array, (...)
+        the latest `_order+2` iterates, oldest first
+
+    _order : int
+        order of the acceleration, default: 2
+
+    Returns
+    -------
+
+    _x : np.double, np.array, (...)
+        extrapolated iterate
+
+    Notes
+    -----
+
+    With iterates :math:`X^0` (latest), ..., :math:`X^{M+1}` and
+    :math:`D^m = X^m - X^{m+1}`, the coefficients :math:`a_m` minimize
+    :math:`\| D^0 - \sum_m a_m (D^0 - D^m) \|` with weights :math:`1/(X^0)^2`, then [1]_
+
+    .. math:: X^* = (1 - \sum_m a_m) X^0 + \sum_m a_m X^m
+
+    References
+    ----------
+
+    .. [1] L.Auer, "Acceleration of Convergence", in "Numerical Radiative Transfer",
+        ed. W.Kalkofen, Cambridge University Press, pp. 101, 1987.
+    """
+    assert len(_X) == _order + 2, "_order+2 iterates are required."
+
+    X = [ np.asarray(_x, dtype=np.double).ravel() for _x in _X[::-1] ]   # latest first
+    D = [ X[m] - X[m+1] for m in range(_order+1) ]
+    w = 1. / np.maximum( X[0]*X[0], np.finfo(np.double).tiny )
+
+    Q = np.array([ D[0] - D[m] for m in range(1, _order+1) ])           # (order, n)
+    A = (Q * w) @ Q.T
+    b = (Q * w) @ D[0]
+    try:
+        a = np.linalg.solve(A, b)
+    except np.linalg.LinAlgError:
+        return np.asarray(_X[-1], dtype=np.double).copy()
+
+    x = (1. - a.sum()) * X[0]
+    for m in range(1, _order+1):
+        x += a[m-1] * X[m]
+
+    return x.reshape(np.shape(_X[-1]))
+
+def get_residual(_x, _gx):
+    r"""
+    root mean square relative residual of a fixed-point iteration,
+    the norm with weights :math:`1/g(x)^2` minimized by `Ng_extrapolate`.
+    """
+    r = (_gx - _x) / np.maximum( np.abs(_gx), np.finfo(np.double).tiny )
+
+    return np.sqrt( np.mean( r * r ) )
+
+################################################################################
+# acceleration of a fixed-point iteration x_{k+1} = g(x_k)
+#    - history kept in a ring buffer of fixed size
+################################################################################
+
+class Accelerator:
+
+    def __init__(self, _shape, _method="Ng", _order=2, _delay=0, _beta=1., _positive=True, _safeguard=True):
+        r"""
+        initial method of class Accelerator.
+
+        Parameters
+        ----------
+
+        _shape : tuple of int
+            shape of the iterate, e.g. (nDepth, nLevel)
+
+        _method : str
+            "Ng" : Ng acceleration of order `_order` (2 or 3), applied every `_order+2` steps,
+            "Anderson" : Anderson mixing with the latest `_order` differences, applied every step.
+            default: "Ng"
+
+        _order : int
+            order of Ng acceleration or depth of Anderson mixing, default: 2
+
+        _delay : int
+            number of plain steps before the history starts, default: 0
+
+        _beta : np.double
+            mixing parameter of Anderson mixing, default: 1
+
+        _positive : bool
+            whether to reject an extrapolated iterate with non-positive elements
+            (the plain step g(x) is taken instead), default: True
+
+        _safeguard : bool
+            Ng only, whether to reject an extrapolated iterate whose residual
+            (see `get_residual`) exceeds the residual of the plain step it replaced,
+            default: True
+
+        Notes
+        -----
+
+        The history is kept in preallocated arrays of `_order+2` (Ng) or `_order+1` (Anderson)
+        iterates, so memory does not grow with the number of iterations.
+
+        The residual of an extrapolated iterate is only known at the next step. If it is
+        rejected by `_safeguard`, the plain step it replaced is returned instead, and the
+        number of plain steps between two Ng extrapolations grows by 1.
+
+        Usage in a fixed-point loop ::
+
+            acc = Accelerator(x.shape)
+            while not converged:
+                gx = g(x)
+                x_new = acc.step(x, gx)
+                ...
+                x = x_new
+        """
+        if _method not in ("Ng", "Anderson"):
+            raise ValueError("_method should be either 'Ng' or 'Anderson'.")
+        assert _order >= 1, "_order should be a positive integer."
+
+        self.shape = tuple(_shape)
+        self.method = _method
+        self.order = _order
+        self.delay = _delay
+        self.beta = _beta
+        self.positive = _positive
+        self.safeguard = _safeguard and _method == "Ng"
+
+        size = _order + 2 if _method == "Ng" else _order + 1
+        n = int(np.prod(self.shape))
+        self.buf_x = np.empty((size, n), dtype=np.double)
+        self.buf_f = np.empty((size, n), dtype=np.double) if _method == "Anderson" else None
+        self.size = size
+        self.nStep = 0
+        self.nAccel = 0
+        self.nReject = 0
+        self.spacing = 0
+        self.wait = 0
+        self.x_plain = None
+        self.res_plain = 0.
+        self.reset()
+
+    def reset(self):
+        r"""
+        clear the history, keep the number of steps.
+        """
+        self.head = 0
+        self.count = 0
+
+    def push(self, _x, _f=None):
+        r"""
+        append an iterate (and its residual) to the ring buffer, overwriting the oldest.
+        """
+        self.buf_x[self.head] = _x
+        if _f is not None:
+            self.buf_f[self.head] = _f
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def ordered(self):
+        r"""
+        indices of the ring buffer from the oldest to the latest entry.
+        """
+        return (self.head - self.count + np.arange(self.count)) % self.size
+
+    def step(self, _x, _gx):
+        r"""
+        one step of the accelerated iteration.
+
+        Parameters
+        ----------
+
+        _x : np.double, np.array, `shape`
+            current iterate
+
+        _gx : np.double, np.array, `shape`
+            result of the fixed-point map g(x)
+
+        Returns
+        -------
+
+        _x_new : np.double, np.array, `shape`
+            next iterate, `_gx` itself if no acceleration is applied
+        """
+        self.nStep += 1
+        if self.nStep <= self.delay:
+            return _gx
+
+        x = np.asarray(_x, dtype=np.double).ravel()
+        gx = np.asarray(_gx, dtype=np.double).ravel()
+
+        #--- safeguard, the current x is the latest extrapolated iterate
+        if self.x_plain is not None:
+            x_plain = self.x_plain
+            self.x_plain = None
+            if get_residual(x, gx) > self.res_plain:
+                self.nReject += 1
+                self.spacing += 1
+                self.wait = self.spacing
+                self.reset()
+                return x_plain.reshape(self.shape)
+
+        if self.method == "Ng":
+            x_new = self.step_Ng(x, gx)
+        else:
+            x_new = self.step_Anderson(x, gx)
+
+        if x_new is None:
+            return _gx
+        if self.positive and not (x_new > 0.).all():
+            self.x_plain = None
+            self.reset()
+            return _gx
+
+        self.nAccel += 1
+        return x_new.reshape(self.shape)
+
+    def step_Ng(self, _x, _gx):
+        r"""
+        Ng acceleration, see `Ng_extrapolate`.
+        the extrapolated iterate starts a new sequence after `wait` plain steps.
+        """
+        if self.wait > 0:
+            self.wait -= 1
+            return None
+
+        if self.count == 0:
+            self.push(_x)
+        self.push(_gx)
+        if self.count < self.size:
+            return None
+
+        X = self.buf_x[self.ordered()]
+        x_new = Ng_extrapolate(list(X), self.order)
+        self.reset()
+        self.wait = self.spacing
+        if self.safeguard:
+            self.x_plain = _gx.copy()
+            self.res_plain = get_residual(_x, _gx)
+
+        return x_new
+
+    def step_Anderson(self, _x, _gx):
+        r"""
+        Anderson mixing (type II) with weights :math:`1/g(x)^2` [1]_,
+
+        .. math:: x_{k+1} = x_k + \beta f_k - (\Delta X + \beta \Delta F) \gamma, \quad
+                  \gamma = \arg\min \| f_k - \Delta F \gamma \|
+
+        where :math:`f = g(x) - x`, :math:`\Delta X, \Delta F` are the differences of
+        consecutive x, f in the history.
+
+        References
+        ----------
+
+        .. [1] H.F. Walker, P. Ni, "Anderson acceleration for fixed-point iterations",
+            SIAM Journal on Numerical Analysis, Volume 49, Issue 4, pp. 1715-1735, 2011.
+        """
+        f = _gx - _x
+        self.push(_x, f)
+        if self.count < 2:
+            return None
+
+        idx = self.ordered()
+        dX = np.diff(self.buf_x[idx], axis=0)            # (m, n)
+        dF = np.diff(self.buf_f[idx], axis=0)
+        w = 1. / np.maximum( np.abs(_gx), np.finfo(np.double).tiny )
+
+        gamma = np.linalg.lstsq( (dF * w).T, f * w, rcond=None )[0]
+
+        return _x + self.beta * f - (dX + self.beta * dF).T @ gamma
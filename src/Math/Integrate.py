@@ -52,6 +52,167 @@ def Trapze(integrand, x):
         sum += dx[i] * integrand[i]
     return sum
 
+################################################################################
+# quadrature weights for a fixed mesh
+#    - computed once and reused by `Integrate_axis`
+################################################################################
+
+def Trapze_weights(x):
+    r"""
+    weights of the Trapzoidal rule, `Trapze(y, x) == Trapze_weights(x) @ y`
+
+    Parameters
+    ----------
+    x : array-like of np.double, (n,)
+        independent variable x, n >= 2
+
+    Returns
+    -------
+
+    w : np.double, np.array, (n,)
+        quadrature weights
+    """
+    x = np.asarray(x, dtype=np.double)
+    assert x.ndim == 1 and x.size >= 2, "x should be a 1D array with at least 2 points."
+
+    w = np.empty(x.size, dtype=np.double)
+    w[1:-1] = 0.5 * (x[2:] - x[:-2])
+    w[0] = 0.5 * (x[1] - x[0])
+    w[-1] = 0.5 * (x[-1] - x[-2])
+
+    return w
+
+def Simpson_weights(x):
+    r"""
+    weights of the composite Simpson's rule on a (non-)uniform mesh,
+    `Simpson_weights(x) @ y` integrates y over x.
+
+    Parameters
+    ----------
+    x : array-like of np.double, (n,)
+        independent variable x, n >= 3
+
+    Returns
+    -------
+
+    w : np.double, np.array, (n,)
+        quadrature weights
+
+    Notes
+    ------
+    Each pair of intervals :math:`h_0, h_1` contributes [1]_
+
+    .. math:: \frac{h_0+h_1}{6} \left[ \left(2-\frac{h_1}{h_0}\right) y_0
+              + \frac{(h_0+h_1)^2}{h_0 h_1} y_1 + \left(2-\frac{h_0}{h_1}\right) y_2 \right]
+
+    if the number of intervals is odd, the last interval uses the Trapzoidal rule.
+
+    References
+    ----------
+    .. [1] Simpson's rule, wikipedia, https://en.wikipedia.org/wiki/Simpson%27s_rule
+    """
+    x = np.asarray(x, dtype=np.double)
+    assert x.ndim == 1 and x.size >= 3, "x should be a 1D array with at least 3 points."
+
+    n = x.size
+    m = (n - 1) // 2 * 2               # number of intervals done by Simpson's rule
+    h0 = x[1:m:2] - x[0:m-1:2]
+    h1 = x[2:m+1:2] - x[1:m:2]
+    hs = (h0 + h1) / 6.
+
+    w = np.zeros(n, dtype=np.double)
+    w[0:m-1:2] += hs * (2. - h1 / h0)
+    w[1:m:2] += hs * (h0 + h1)**2 / (h0 * h1)
+    w[2:m+1:2] += hs * (2. - h0 / h1)
+    if m < n - 1:
+        w[-2] += 0.5 * (x[-1] - x[-2])
+        w[-1] += 0.5 * (x[-1] - x[-2])
+
+    return w
+
+def Gauss_Hermite(n):
+    r"""
+    nodes and weights of the n point Gauss-Hermite quadrature for
+    Doppler width normalized gaussian profile,
+
+    .. math:: \int \frac{e^{-x^2}}{\sqrt{\pi}} f(x) dx \approx \sum_k w_k f(x_k)
+
+    Parameters
+    ----------
+    n : int
+        number of nodes
+
+    Returns
+    -------
+
+    x : np.double, np.array, (n,)
+        nodes, Doppler width normalized mesh, [-]
+
+    w : np.double, np.array, (n,)
+        weights, sum up to 1
+    """
+    x, w = np.polynomial.hermite.hermgauss(n)
+
+    return x, w / Cst.sqrtPi_
+
+################################################################################
+# integration of multi-dimensional arrays along an axis
+################################################################################
+
+def Integrate_axis(integrand, w, axis=-1):
+    r"""
+    integrate a stack of integrands along an axis with precomputed weights
+
+    Parameters
+    ----------
+    integrand : array-like of np.double, (..., n, ...)
+        integrand as a function of variable x along `axis`
+
+    w : array-like of np.double, (n,)
+        quadrature weights, e.g. from `Trapze_weights`, `Simpson_weights`
+
+    axis : int
+        axis of the variable x, default: -1
+
+    Returns
+    -------
+
+    sum : np.double or np.array
+         result of integration, `integrand` without `axis`
+    """
+    integrand = np.moveaxis( np.asarray(integrand), axis, -1 )
+
+    return integrand @ w
+
+def Trapze_cumulative(integrand, x, axis=-1):
+    r"""
+    cumulative integral using Trapzoidal rule, starting from 0 at x[0]
+
+    Parameters
+    ----------
+    integrand : array-like of np.double, (..., n, ...)
+        integrand as a function of variable x along `axis`
+
+    x : array-like of np.double, (n,)
+        independent variable x
+
+    axis : int
+        axis of the variable x, default: -1
+
+    Returns
+    -------
+
+    sum : np.double, np.array, same shape with `integrand`
+         integral from x[0] to each x[i]
+    """
+    integrand = np.moveaxis( np.asarray(integrand, dtype=np.double), axis, -1 )
+    x = np.asarray(x, dtype=np.double)
+
+    sum = np.zeros(integrand.shape, dtype=np.double)
+    np.cumsum( 0.5 * (integrand[...,1:] + integrand[...,:-1]) * (x[1:] - x[:-1]), axis=-1, out=sum[...,1:] )
+
+    return np.moveaxis(sum, -1, axis)
+
 ################################################################################
 # whether to compile them using numba's LLVM
 ################################################################################
@@ -0,0 +1,60 @@
+################################################################################
+# this file defines functions for
+#     interpolation on tabulated grids
+################################################################################
+
+import numpy as np
+
+def locate_grid(_grid, _x):
+    r"""
+    locate points in a sorted grid for interpolation.
+
+    Parameters
+    ----------
+
+    _grid : np.double, np.array, (n,)
+        sorted grid points, n >= 2
+
+    _x : np.double, np.array, (...)
+        points to locate, clipped into [_grid[0], _grid[-1]]
+
+    Returns
+    -------
+
+    _i : np.int, np.array, (...)
+        index of the left grid point, 0 <= _i <= n-2
+
+    _t : np.double, np.array, (...)
+        fractional distance from the left grid point, 0 <= _t <= 1
+    """
+    _x = np.clip(_x, _grid[0], _grid[-1])
+    _i = np.clip( np.searchsorted(_grid, _x, side="right") - 1, 0, _grid.size-2 )
+    _t = (_x - _grid[_i]) / (_grid[_i+1] - _grid[_i])
+
+    return _i, _t
+
+def cubic_weights(_t):
+    r"""
+    weights of the 4 neighbouring grid points (i-1, i, i+1, i+2)
+    of the Catmull-Rom cubic convolution.
+
+    Parameters
+    ----------
+
+    _t : np.double, np.array, (...)
+        fractional distance from grid point i
+
+    Returns
+    -------
+
+    _w : np.double, np.array, (4, ...)
+        weights, sum to 1
+    """
+    _t2 = _t * _t
+    _t3 = _t2 * _t
+    _w = np.array([ 0.5 * (-_t3 + 2.*_t2 - _t),
+                    0.5 * (3.*_t3 - 5.*_t2 + 2.),
+                    0.5 * (-3.*_t3 + 4.*_t2 + _t),
+                    0.5 * (_t3 - _t2) ])
+
+    return _w
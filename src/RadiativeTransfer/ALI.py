@@ -0,0 +1,237 @@
+################################################################################
+# this file defines the accelerated lambda iteration (ALI) driver
+#     coupling the statistical equilibrium with line radiative transfer
+#     in the MALI formulation of Rybicki & Hummer (1991)
+################################################################################
+
+import numpy as np
+
+from . import ShortCharacteristics
+from ..Atomic import SEsolver
+from ..Math import Integrate
+from ..Math import Acceleration
+
+################################################################################
+# number of recent iterations whose largest contraction rate estimates
+#     the convergence rate of the plain MALI iteration
+################################################################################
+
+rho_window_ = 5
+
+
+def get_radiation(_quad, _n, _z, _active, _chi_c=0., _S_c=0., _I_top=0., _I_bottom=0., _order=1):
+    r"""
+    formal solution of the active lines for given level populations.
+
+    Parameters
+    ----------
+
+    _quad : Quadrature.LineQuadrature
+        frequency-by-angle quadrature of the atom
+
+    _n : np.double, np.array, (nDepth, nLevel)
+        level population, [:math:`cm^{-3}`]
+
+    _z : np.double, np.array, (nDepth,)
+        height, decreasing with depth index, [:math:`cm`]
+
+    _active : np.intp, np.array, (nActive,)
+        line index of lines solved by radiative transfer
+
+    _chi_c : np.double or np.array, broadcastable to (nDepth, nActive, nX)
+        background continuum opacity, [:math:`cm^{-1}`], default: 0
+
+    _S_c : np.double or np.array, broadcastable to (nDepth, nActive, nX)
+        background continuum source function, [:math:`erg/cm^{2}/Sr/Hz/s`], default: 0
+
+    _I_top, _I_bottom : np.double or np.array, broadcastable to (nActive, nX, nMu)
+        incident intensity at the top/bottom, [:math:`erg/cm^{2}/Sr/Hz/s`],
+        default: 0, a finite slab without incident radiation.
+        `_I_bottom=None` thermalizes the bottom (I = S), a semi-infinite atmosphere.
+
+    _order : int
+        interpolation order of `ShortCharacteristics.solve_SC`, default: 1
+
+    Returns
+    -------
+
+    _Jbar : np.double, np.array, (nDepth, nActive)
+        profile weighted mean intensity, [:math:`erg/cm^{2}/Sr/Hz/s`]
+
+    _Lbar : np.double, np.array, (nDepth, nActive)
+        diagonal of the Lambda operator acting on the line source function,
+        :math:`\partial \bar{J} / \partial S_l`, [-]
+
+    _S_l : np.double, np.array, (nDepth, nActive)
+        line source function, [:math:`erg/cm^{2}/Sr/Hz/s`]
+    """
+    _chi_l = _quad.get_line_opacity(_n)[:,_active,:]
+    _S_l = _quad.get_line_source_function(_n)[:,_active]
+
+    #--- S and chi_l/chi are 0 where the total opacity is 0, e.g. far wings without continuum
+    _chi = _chi_l + _chi_c
+    _has = _chi > 0.
+    _eta = _chi_l * _S_l[...,None] + _chi_c * _S_c
+    _S = np.divide(_eta, _chi, out=np.zeros_like(_eta), where=_has)
+    _ratio = np.divide(_chi_l, _chi, out=np.zeros_like(_chi_l), where=_has)
+    _tau = Integrate.Trapze_cumulative(_chi, -np.asarray(_z, dtype=np.double), axis=0)
+
+    _I, _Lstar = ShortCharacteristics.solve_SC(_tau, _S, _quad.mu, _I_top=_I_top, _I_bottom=_I_bottom, _order=_order)
+
+    _W = _quad.W[:,_active]
+    _Jbar = np.einsum("dlkm,dlkm->dl", _W, _I, optimize=True)
+    _Lbar = np.einsum("dlkm,dlkm,dlk->dl", _W, _Lstar, _ratio, optimize=True)
+
+    return _Jbar, _Lbar, _S_l
+
+
+def solve_ALI(_quad, _Cmat, _n, _z, _chi_c=0., _S_c=0., _I_top=0., _I_bottom=0., _tol=1.E-4, _maxIter=200,
+              _Ng_order=2, _Ng_delay=3, _accelerator=None, _order=1, _verbose=False):
+    r"""
+    solve the non-LTE level populations by the MALI iteration.
+
+    Parameters
+    ----------
+
+    _quad : Quadrature.LineQuadrature
+        frequency-by-angle quadrature of the atom
+
+    _Cmat : np.double, np.array, (nDepth, nLevel, nLevel)
+        collisional rate matrix, see `SEsolver.setMatrixC`, [:math:`s^{-1}`]
+
+    _n : np.double, np.array, (nDepth, nLevel)
+        initial level population, e.g. LTE, [:math:`cm^{-3}`].
+        the total population of each depth is kept.
+
+    _z : np.double, np.array, (nDepth,)
+        height, decreasing with depth index, [:math:`cm`]
+
+    _chi_c, _S_c : np.double or np.array, broadcastable to (nDepth, nActive, nX)
+        background continuum opacity [:math:`cm^{-1}`] and source function, default: 0
+
+    _I_top, _I_bottom : np.double or np.array, broadcastable to (nActive, nX, nMu)
+        incident intensity at the top/bottom, default: 0, a finite slab.
+        `_I_bottom=None` for a semi-infinite atmosphere, see `get_radiation`
+
+    _tol : np.double
+        convergence criterion on the estimated relative error of the returned population,
+        :math:`\rho / (1 - \rho) \max |g(n) - n| / g(n)` with the MALI update g, default: 1E-4
+
+    _maxIter : int
+        maximum number of iterations, default: 200
+
+    _Ng_order : int
+        order of Ng acceleration, 0 to turn it off, default: 2
+
+    _Ng_delay : int
+        number of plain iterations before the first Ng acceleration, default: 3
+
+    _accelerator : Acceleration.Accelerator
+        acceleration of the population iteration, e.g. Anderson mixing,
+        default: None, Ng acceleration with `_Ng_order` and `_Ng_delay`
+
+    _order : int
+        interpolation order of the short characteristics, default: 1.
+        the parabolic scheme (2) may overshoot and give negative rates
+        where the source function changes by orders of magnitude between depth points.
+
+    _verbose : bool
+        print the change of each iteration, default: False
+
+    Returns
+    -------
+
+    _n : np.double, np.array, (nDepth, nLevel)
+        level population, [:math:`cm^{-3}`]
+
+    _info : dict
+        "converged" : bool, "nIter" : int,
+        "dn" : list of the residual :math:`\max |g(n) - n| / g(n)` of each iteration,
+        "rho" : list of the estimated contraction rate of g,
+        "err" : list of the estimated error of each iteration
+
+    Notes
+    -----
+
+    Only lines with Aji > 0 are solved by radiative transfer. Writing
+    :math:`\bar{J} = \Lambda^* S_l + (\bar{J}^{old} - \Lambda^* S_l^{old})`, the
+    rates passed to `SEsolver.setMatrixR` become linear in the new populations [1]_,
+
+    .. math:: R_{ji} = A_{ji} (1 - \Lambda^*) + B_{ji} \Delta J, \quad R_{ij} = B_{ij} \Delta J
+
+    and SE of all depths is solved by `SEsolver.solveSE_batch` in one call.
+
+    The residual is measured before acceleration, an accelerated change of
+    population can be small while the iterate is still away from the fixed point.
+    The returned population is the plain update g(n) of the last iteration,
+    its distance to the fixed point is at most :math:`\rho / (1 - \rho)` times
+    the residual, with :math:`\rho` the contraction rate of g. It is estimated by
+    :math:`\max |g(n_k) - g(n_{k-1})| / \max |n_k - n_{k-1}|`, the largest over
+    the last `rho_window_` iterations. Close to 1 for scattering dominated lines,
+    where a small residual alone stops far from the fixed point.
+
+    References
+    ----------
+
+    .. [1] G.B. Rybicki, D.G. Hummer, "An accelerated lambda iteration method for
+        multilevel radiative transfer. I - Non-overlapping lines with background continuum",
+        Astronomy and Astrophysics, Volume 245, pp. 171-181, 1991.
+    """
+    _n = np.array(_n, dtype=np.double)
+    _nTot = _n.sum(axis=-1, keepdims=True)
+    _nDepth, _nLevel = _n.shape
+
+    _active = np.nonzero(_quad.AJI > 0.)[0]
+    _idxI = _quad.idxI[_active]
+    _idxJ = _quad.idxJ[_active]
+    _AJI = _quad.AJI[_active]
+    _Bji = _quad.Bji[_active]
+    _Bij = _quad.Bij[_active]
+
+    if _accelerator is None and _Ng_order > 0:
+        _accelerator = Acceleration.Accelerator(_n.shape, "Ng", _Ng_order, _Ng_delay)
+
+    _info = { "converged" : False, "nIter" : 0, "dn" : [], "rho" : [], "err" : [] }
+    _n_prev = _g_prev = None
+    for _it in range(1, _maxIter+1):
+        _Jbar, _Lbar, _S_l = get_radiation(_quad, _n, _z, _active, _chi_c, _S_c,
+                                           _I_top, _I_bottom, _order)
+        _dJ = _Jbar - _Lbar * _S_l
+
+        _Rmat = np.zeros((_nDepth, _nLevel, _nLevel), dtype=np.double)
+        SEsolver.setMatrixR(_Rmat, _AJI * (1. - _Lbar), _Bji * _dJ, _Bij * _dJ, _idxI, _idxJ)
+        _n_new = SEsolver.solveSE_batch(_Rmat, _Cmat) * _nTot
+
+        #--- residual of the plain iteration
+        _dn = np.max( np.abs(_n_new - _n) / _n_new )
+
+        #--- contraction rate of the plain update g between the last two iterates
+        if _n_prev is not None:
+            _dx = np.max( np.abs(_n - _n_prev) / _n_new )
+            if _dx > 0.:
+                _info["rho"].append( np.max( np.abs(_n_new - _g_prev) / _n_new ) / _dx )
+        _n_prev, _g_prev = _n, _n_new
+
+        #--- estimated error of the plain update, rho / (1 - rho) * residual
+        _rho = min( max(_info["rho"][-rho_window_:]), 1. ) if _info["rho"] else 1.
+        _err = _dn * _rho / (1. - _rho) if _rho < 1. else np.inf
+        if _dn == 0.:
+            _err = 0.
+
+        _info["dn"].append(_dn)
+        _info["err"].append(_err)
+        _info["nIter"] = _it
+        if _verbose:
+            print(f"iteration {_it:4d}, residual {_dn:.3e}, rate {_rho:.3f}, error {_err:.3e}")
+
+        if _err < _tol:
+            _n = _n_new
+            _info["converged"] = True
+            break
+
+        #--- acceleration
+        if _accelerator is not None:
+            _n_new = _accelerator.step(_n, _n_new)
+        _n = _n_new
+
+    return _n, _info
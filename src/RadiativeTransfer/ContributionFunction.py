@@ -0,0 +1,287 @@
+################################################################################
+# this file defines functions for
+#     generating contribution function G(Te, Ne) tables of an atom
+#     under the assumption of optically thin
+################################################################################
+
+import os
+import multiprocessing
+
+import numpy as np
+
+from . import Thin
+from ..Math import Interpolate
+
+################################################################################
+# arrays of the atom needed by `Thin.get_SE_relative_flux`,
+# set once in each worker process by `init_worker`
+################################################################################
+
+atom_arrays_ = None
+
+def get_atom_arrays(_atom):
+    r"""
+    pack the arrays of an atom needed by `Thin.get_SE_relative_flux`.
+
+    Parameters
+    ----------
+
+    _atom : AtomCls.Atom
+        atom with Aji and electron impact CE data,
+        CE of type "ECS" only, the formula `Thin.get_SE_relative_flux` hard-codes
+
+    Returns
+    -------
+
+    _arrays : tuple of np.array
+        (erg, g, stage, AJI, f0, idxI, idxJ, CE_idxI, CE_idxJ, Bsp_t, Bsp_c, Bsp_k, f1, f2)
+    """
+    assert _atom.CE_type == "ECS", \
+        'CE type "{}" is not supported, only "ECS".'.format(_atom.CE_type)
+
+    _arrays = ( _atom.Level.erg[:], _atom.Level.g[:], _atom.Level.stage[:],
+                _atom.Line.AJI[:], _atom.Line.f0[:], _atom.Line.idxI[:], _atom.Line.idxJ[:],
+                _atom.CE_coe.idxI[:], _atom.CE_coe.idxJ[:],
+                _atom.CE_Bsp_t[:], _atom.CE_Bsp_c[:,:], _atom.CE_Bsp_k,
+                _atom.CE_coe.f1[:], _atom.CE_coe.f2[:] )
+    # contiguous copies, numba and pickle do not like strided recarray fields
+    _arrays = tuple( np.ascontiguousarray(_v) if isinstance(_v, np.ndarray) else _v for _v in _arrays )
+
+    return _arrays
+
+def init_worker(_arrays):
+    r"""
+    initializer of worker processes, keep the atom arrays as a module global.
+    """
+    global atom_arrays_
+    atom_arrays_ = _arrays
+
+def solve_chunk(_chunk):
+    r"""
+    solve SE and relative flux for a chunk of grid points.
+
+    Parameters
+    ----------
+
+    _chunk : tuple
+        (start, Te, Ne), index of the first grid point and
+        np.double arrays of temperature/density of the chunk
+
+    Returns
+    -------
+
+    _res : tuple
+        (start, nArr, rf)
+    """
+    _start, _Te, _Ne = _chunk
+    _nArr, _rf = Thin.get_SE_relative_flux(*atom_arrays_, _Te, _Ne)
+
+    return _start, _nArr, _rf
+
+def make_CF_table(_atom, _logTe, _logNe, _dir, _nChunk=4096, _nProcess=1):
+    r"""
+    compute the optically thin relative flux of every line of an atom
+    over a (log10 Te, log10 Ne) grid and save the table to a directory.
+
+    Parameters
+    ----------
+
+    _atom : AtomCls.Atom
+        atom with Aji and electron impact CE data
+
+    _logTe : np.double, np.array, (nTe,)
+        log10 of electron temperature, [:math:`K`]
+
+    _logNe : np.double, np.array, (nNe,)
+        log10 of electron density, [:math:`cm^{-3}`]
+
+    _dir : str
+        output directory
+
+    _nChunk : int
+        number of grid points solved at once by a process, default: 4096
+
+    _nProcess : int
+        number of processes, `None` for all cpus, default: 1
+
+    Returns
+    -------
+
+    _G : np.memmap, (nTe, nNe, nLine)
+        relative flux table opened in read mode. [:math:`erg \; s^{-1}`]
+
+    Notes
+    -----
+
+    Files in `_dir`:
+
+        - "info.npz" : logTe, logNe, Title, and Line idxI, idxJ, AJI, f0, w0_AA
+        - "G.npy" : relative flux, (nTe, nNe, nLine), see `Thin.get_relative_flux`
+        - "nArr.npy" : normalized level population, (nTe, nNe, nLevel)
+
+    "G.npy" and "nArr.npy" are memory mapped and filled chunk by chunk as
+    results arrive, so memory use is bounded by `_nChunk` times the number of processes.
+    With `_nProcess > 1` the kernel is compiled in the parent before the pool is forked,
+    so workers do not compile it again (on platforms that fork).
+    The contribution function in the usual sense is `G / Ne`.
+    """
+    _logTe = np.asarray(_logTe, dtype=np.double)
+    _logNe = np.asarray(_logNe, dtype=np.double)
+    _nTe, _nNe = _logTe.size, _logNe.size
+    _nPoint = _nTe * _nNe
+
+    os.makedirs(_dir, exist_ok=True)
+    np.savez(os.path.join(_dir, "info.npz"), logTe=_logTe, logNe=_logNe, Title=_atom.Title,
+             idxI=_atom.Line.idxI[:], idxJ=_atom.Line.idxJ[:], AJI=_atom.Line.AJI[:],
+             f0=_atom.Line.f0[:], w0_AA=_atom.Line.w0_AA[:])
+
+    _G = np.lib.format.open_memmap(os.path.join(_dir, "G.npy"), mode="w+",
+                                   dtype=np.double, shape=(_nTe, _nNe, _atom.nLine))
+    _nArr = np.lib.format.open_memmap(os.path.join(_dir, "nArr.npy"), mode="w+",
+                                      dtype=np.double, shape=(_nTe, _nNe, _atom.nLevel))
+    _G_flat = _G.reshape(_nPoint, _atom.nLine)
+    _nArr_flat = _nArr.reshape(_nPoint, _atom.nLevel)
+
+    def _chunks():
+        for _start in range(0, _nPoint, _nChunk):
+            _p = np.arange(_start, min(_start+_nChunk, _nPoint))
+            yield _start, 10.**_logTe[_p // _nNe], 10.**_logNe[_p % _nNe]
+
+    _arrays = get_atom_arrays(_atom)
+    init_worker(_arrays)
+    if _nProcess == 1:
+        _results = map(solve_chunk, _chunks())
+        _pool = None
+    else:
+        #--- compile the kernel once in the parent, forked workers inherit it
+        solve_chunk( (0, 10.**_logTe[:1], 10.**_logNe[:1]) )
+        _pool = multiprocessing.Pool(_nProcess, initializer=init_worker, initargs=(_arrays,))
+        _results = _pool.imap_unordered(solve_chunk, _chunks())
+
+    try:
+        for _start, _n, _rf in _results:
+            _G_flat[_start:_start+_rf.shape[0],:] = _rf[:,:]
+            _nArr_flat[_start:_start+_n.shape[0],:] = _n[:,:]
+    finally:
+        if _pool is not None:
+            _pool.close()
+            _pool.join()
+
+    _G.flush()
+    _nArr.flush()
+    del _G, _nArr, _G_flat, _nArr_flat
+
+    return np.load(os.path.join(_dir, "G.npy"), mmap_mode="r")
+
+################################################################################
+# interpolation of precomputed tables
+################################################################################
+
+class CF_Table:
+
+    def __init__(self, _dir):
+        r"""
+        initial method of class CF_Table,
+        load a table made by `make_CF_table`.
+
+        Parameters
+        ----------
+
+        _dir : str
+            directory of the table
+        """
+        with np.load(os.path.join(_dir, "info.npz")) as _info:
+            self.logTe = _info["logTe"]
+            self.logNe = _info["logNe"]
+            self.Title = str( _info["Title"] )
+            self.idxI = _info["idxI"]
+            self.idxJ = _info["idxJ"]
+            self.AJI = _info["AJI"]
+            self.f0 = _info["f0"]
+            self.w0_AA = _info["w0_AA"]
+
+        self.G = np.load(os.path.join(_dir, "G.npy"))
+        self.nLine = self.G.shape[-1]
+
+        #--- (idxI, idxJ) --> line index, same as `Atom.Line_idx_dict`
+        self.Line_idx_dict = { (int(i), int(j)) : k for k, (i, j) in enumerate(zip(self.idxI, self.idxJ)) }
+
+    def line_idx_to_line_index(self, line_idx):
+        r"""
+        (idxI, idxJ) --> line index (line No.)
+        """
+
+        return self.Line_idx_dict[line_idx]
+
+    def interpolate(self, _Te, _Ne, _line_index=None, _method="bilinear"):
+        r"""
+        interpolate the relative flux table in (log10 Te, log10 Ne).
+
+        Parameters
+        ----------
+
+        _Te : np.double, np.array, (...)
+            electron temperature, [:math:`K`]
+
+        _Ne : np.double, np.array, (...)
+            electron density, [:math:`cm^{-3}`]
+
+        _line_index : int, array-like of int, None
+            line index (line No.) of lines to interpolate, `None` for all lines, default: None.
+            the last axis of the result is dropped for an int
+
+        _method : str
+            "bilinear" or "bicubic" (Catmull-Rom, assuming an evenly spaced grid), default: "bilinear"
+
+        Returns
+        -------
+
+        _rf : np.double, np.array, (..., nSelected); (...)
+            relative flux in the order of `Atom.Line`, see `Thin.get_relative_flux`. [:math:`erg \; s^{-1}`]
+
+        Notes
+        -----
+
+        (Te, Ne) outside of the table are clipped to the boundary of the table.
+        The bicubic result is clipped at 0, since Catmull-Rom weights can overshoot
+        where the table changes steeply.
+        """
+        _logTe, _logNe = np.broadcast_arrays( np.log10(_Te), np.log10(_Ne) )
+        _shape = _logTe.shape
+        _logTe = _logTe.ravel()
+        _logNe = _logNe.ravel()
+
+        if _line_index is None:
+            _line_index = np.arange(self.nLine)
+        _isScalar = np.ndim(_line_index) == 0
+        _line_index = np.atleast_1d(_line_index)[None,:]
+
+        _iT, _tT = Interpolate.locate_grid(self.logTe, _logTe)
+        _iN, _tN = Interpolate.locate_grid(self.logNe, _logNe)
+
+        if _method == "bilinear":
+            _offsets = (0, 1)
+            _wT = np.array([1.-_tT, _tT])
+            _wN = np.array([1.-_tN, _tN])
+        elif _method == "bicubic":
+            _offsets = (-1, 0, 1, 2)
+            _wT = Interpolate.cubic_weights(_tT)
+            _wN = Interpolate.cubic_weights(_tN)
+        else:
+            raise ValueError("_method should be either 'bilinear' or 'bicubic'.")
+
+        _rf = np.zeros((_logTe.size, _line_index.shape[1]), dtype=np.double)
+        for _a, _dT in enumerate(_offsets):
+            _kT = np.clip(_iT + _dT, 0, self.logTe.size-1)[:,None]
+            for _b, _dN in enumerate(_offsets):
+                _kN = np.clip(_iN + _dN, 0, self.logNe.size-1)[:,None]
+                _rf += (_wT[_a] * _wN[_b])[:,None] * self.G[_kT, _kN, _line_index]
+
+        if _method == "bicubic":
+            np.maximum(_rf, 0., out=_rf)
+
+        _rf = _rf.reshape(_shape + (_line_index.shape[1],))
+        if _isScalar:
+            _rf = _rf[...,0]
+
+        return _rf
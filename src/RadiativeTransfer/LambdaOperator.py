@@ -0,0 +1,295 @@
+################################################################################
+# this file defines the Lambda operator of a plane-parallel atmosphere
+#     J = Lambda[S], built from exponential integrals E2/E3 for
+#     piecewise linear source functions, for many frequencies at once
+################################################################################
+
+import numpy as np
+
+from ..Math import Special
+from ..Math import Integrate
+
+
+################################################################################
+# E2(x), E3(x) for x >= 0, extended to x = 0 and x > 80
+################################################################################
+
+def get_E2_E3(x):
+    r"""
+    Exponential integrals :math:`E_2(x)` and :math:`E_3(x)` for any x >= 0.
+
+    Parameters
+    ----------
+
+    x : np.double, np.array
+        independent variable x, >= 0
+
+    Returns
+    -------
+
+    E2, E3 : np.double, np.array
+        2nd and 3rd order Exponential integral of x
+
+    Notes
+    -----
+
+    `Special.E1` is valid in (0, 80], x is clipped into it,
+    with :math:`E_2(0)=1, E_3(0)=1/2` and 0 for x > 80.
+
+    .. math:: E_3(x) = [e^{-x} - xE_2(x)] / 2
+    """
+    x = np.asarray(x, dtype=np.double)
+    xc = np.clip(x, 1.E-300, 80.)
+
+    E2 = Special.E2(xc)
+    E3 = 0.5 * ( np.exp(-xc) - xc * E2 )
+
+    far = x > 80.
+    E2[far] = 0.
+    E3[far] = 0.
+
+    return E2, E3
+
+################################################################################
+# moments of E1 over a short interval [a, a+h], h < small_h_
+################################################################################
+
+small_h_ = 1.E-4
+euler_gamma_ = 0.5772156649015329
+
+def get_E1_moments_small_h(a, h):
+    r"""
+    :math:`I_0 = \int_a^{a+h} E_1(u) du` and
+    :math:`D = \frac{1}{h} \int_a^{a+h} (u-a) E_1(u) du` for a short interval,
+    where differences of E2/E3 lose all digits.
+
+    Parameters
+    ----------
+
+    a : np.double, np.array, (n,)
+        distance of the near edge, >= 0
+
+    h : np.double, np.array, (n,)
+        length of the interval, 0 <= h < `small_h_`
+
+    Returns
+    -------
+
+    I0, D : np.double, np.array, (n,)
+        the two moments, 0 where h = 0
+
+    Notes
+    -----
+
+    For :math:`a > 100h`, Taylor expansion of :math:`E_1` around a,
+    with :math:`E_1' = -e^{-a}/a, E_1'' = e^{-a}(1/a+1/a^2)`,
+
+    .. math:: I_0 = h E_1 + \frac{h^2}{2} E_1' + \frac{h^3}{6} E_1''
+
+    .. math:: D = \frac{h}{2} E_1 + \frac{h^2}{3} E_1' + \frac{h^3}{8} E_1''
+
+    Otherwise :math:`a+h < 0.011`, integrate the series
+    :math:`E_1(u) = -\gamma - \ln u + u - u^2/4 + u^3/18` term by term.
+    Both are accurate to about :math:`10^{-7}`, including a = 0.
+    """
+    I0 = np.zeros_like(a)
+    D = np.zeros_like(a)
+
+    #--- Taylor expansion in h around a
+    m = a > 100. * h
+    am, hm = a[m], h[m]
+    e = np.exp(-am)
+    E1 = np.where( am > 80., 0., Special.E1( np.clip(am, 1.E-300, 80.) ) )
+    d1 = - e / am
+    d2 = e * (1. / am + 1. / (am*am))
+    I0[m] = hm * ( E1 + hm * ( d1 / 2. + hm * d2 / 6. ) )
+    D[m] = hm * ( E1 / 2. + hm * ( d1 / 3. + hm * d2 / 8. ) )
+
+    #--- series of E1 for small argument
+    m = ~m & (h > 0.)
+    am, hm = a[m], h[m]
+    log_b = np.log(am + hm)
+    #--- a * ln(1+h/a) and a^2 * ln(1+h/a), 0 at a = 0
+    pos = am > 0.
+    l1 = np.zeros_like(am)
+    l1[pos] = np.log1p( hm[pos] / am[pos] )
+    l1 *= am
+    l2 = l1 * am
+
+    #--- int_a^{a+h} u^n du, n = 0,1,2,3 and int_a^{a+h} ln(u) du
+    P0 = hm
+    P1 = hm * (am + hm / 2.)
+    P2 = hm * (am*am + hm * (am + hm / 3.))
+    P3 = hm * (am*am*am + hm * (1.5*am*am + hm * (am + hm / 4.)))
+    L0 = hm * log_b + l1 - hm
+    I0[m] = - euler_gamma_ * P0 - L0 + P1 - P2 / 4. + P3 / 18.
+
+    #--- int_0^h s (a+s)^n ds, n = 0,1,2,3 and int_0^h s ln(a+s) ds, divided by h
+    Q0 = hm / 2.
+    Q1 = hm * (am / 2. + hm / 3.)
+    Q2 = hm * (am*am / 2. + hm * (2. * am / 3. + hm / 4.))
+    Q3 = hm * (am*am*am / 2. + hm * (am*am + hm * (0.75 * am + hm / 5.)))
+    L1 = hm / 2. * log_b - l2 / (2. * hm) + am / 2. - hm / 4.
+    D[m] = - euler_gamma_ * Q0 - L1 + Q1 - Q2 / 4. + Q3 / 18.
+
+    return I0, D
+
+
+class LambdaOperator:
+
+    def __init__(self, _tau, _semi_infinite=True, _nChunk=64):
+        r"""
+        initial method of class LambdaOperator,
+        compute and cache the Lambda matrix of every frequency.
+
+        Parameters
+        ----------
+
+        _tau : np.double, np.array, (nFreq, nDepth)
+            optical depth of each frequency, increasing with depth index, [-]
+
+        _semi_infinite : bool
+            True : source function below the last depth point is constant (semi-infinite atmosphere),
+            False : finite slab without incident radiation at the bottom,
+            default: True
+
+        _nChunk : int
+            number of frequencies computed at once, bounds the temporary memory, default: 64
+
+        Notes
+        -----
+
+        With :math:`S` linear in each depth interval and no incident radiation at the top [1]_,
+
+        .. math:: J(\tau) = \frac{1}{2} \int E_1(|t-\tau|) S(t) dt = \sum_j \Lambda_{ij} S_j
+
+        For an interval of length h whose near/far edges are at distance a/b from :math:`\tau_i`,
+
+        .. math:: \int_a^b E_1(u) du = E_2(a) - E_2(b)
+
+        .. math:: \int_a^b (u-a) E_1(u) du = E_3(a) - E_3(b) - h E_2(b)
+
+        The cached Lambda matrix has nFreq * nDepth * nDepth elements.
+
+        References
+        ----------
+
+        .. [1] Ivan Hubeny, Dimitri Mihalas, "Theory of Stellar Atmosphere:
+            An Introduction to Astrophysical Non-equilibrium
+            Quantitative Spectroscopic Analysis",
+            Princeton University Press, pp. 365, 2015.
+        """
+        self.tau = np.atleast_2d( np.asarray(_tau, dtype=np.double) )
+        self.semi_infinite = _semi_infinite
+        nFreq, nDepth = self.tau.shape
+        assert nDepth >= 2, "at least 2 depth points are required."
+
+        self.Lambda = np.empty((nFreq, nDepth, nDepth), dtype=np.double)
+        for start in range(0, nFreq, _nChunk):
+            self.Lambda[start:start+_nChunk] = self.make_Lambda(self.tau[start:start+_nChunk])
+
+        idx = np.arange(nDepth)
+        self.diagonal = self.Lambda[:, idx, idx].copy()
+
+    def make_Lambda(self, _tau):
+        r"""
+        compute Lambda matrices of a chunk of frequencies.
+
+        Parameters
+        ----------
+
+        _tau : np.double, np.array, (n, nDepth)
+            optical depth, [-]
+
+        Returns
+        -------
+
+        _Lambda : np.double, np.array, (n, nDepth, nDepth)
+            Lambda matrix, `J[:,i] = _Lambda[:,i,:] @ S`
+        """
+        n, nDepth = _tau.shape
+
+        #--- E2, E3 of distance between tau_i and tau_k, (n, i, k)
+        dist = np.abs( _tau[:,None,:] - _tau[:,:,None] )
+        E2, E3 = get_E2_E3(dist)
+        h = np.diff(_tau, axis=-1)[:,None,:]                 # (n, 1, k)
+
+        i = np.arange(nDepth)[:,None]
+        k = np.arange(nDepth-1)[None,:]
+        below = (k >= i)[None,:,:]                           # interval k below tau_i
+
+        #--- near/far edge of interval k seen from tau_i
+        E2_near = np.where(below, E2[:,:,:-1], E2[:,:,1:])
+        E2_far  = np.where(below, E2[:,:,1:], E2[:,:,:-1])
+        E3_near = np.where(below, E3[:,:,:-1], E3[:,:,1:])
+        E3_far  = np.where(below, E3[:,:,1:], E3[:,:,:-1])
+
+        I0 = E2_near - E2_far
+        with np.errstate(divide="ignore", invalid="ignore"):
+            D = ( E3_near - E3_far - h * E2_far ) / h
+
+        #--- short intervals, including repeated tau
+        h = np.broadcast_to(h, D.shape)
+        short = h < small_h_
+        if short.any():
+            a = np.where(below, dist[:,:,:-1], dist[:,:,1:])
+            I0[short], D[short] = get_E1_moments_small_h(a[short], h[short])
+        w_near = 0.5 * (I0 - D)
+        w_far = 0.5 * D
+
+        #--- scatter into the edges k and k+1 of interval k
+        _Lambda = np.zeros((n, nDepth, nDepth), dtype=np.double)
+        _Lambda[:,:,:-1] += np.where(below, w_near, w_far)
+        _Lambda[:,:,1:]  += np.where(below, w_far, w_near)
+
+        if self.semi_infinite:
+            _Lambda[:,:,-1] += 0.5 * E2[:,:,-1]
+
+        return _Lambda
+
+    def get_J(self, _S):
+        r"""
+        mean intensity from the source function.
+
+        Parameters
+        ----------
+
+        _S : np.double, np.array, (nFreq, nDepth)
+            source function of each frequency
+
+        Returns
+        -------
+
+        _J : np.double, np.array, (nFreq, nDepth)
+            mean intensity, same unit with `_S`
+        """
+        _S = np.broadcast_to(_S, self.tau.shape)
+
+        return np.matmul(self.Lambda, _S[...,None])[...,0]
+
+
+def get_optical_depth(_chi, _z, _tau_top=0.):
+    r"""
+    optical depth from opacity along a height grid.
+
+    Parameters
+    ----------
+
+    _chi : np.double, np.array, (..., nDepth)
+        opacity, [:math:`cm^{-1}`]
+
+    _z : np.double, np.array, (nDepth,)
+        height, decreasing with depth index, [:math:`cm`]
+
+    _tau_top : np.double or np.array, (...)
+        optical depth at the first depth point, default: 0
+
+    Returns
+    -------
+
+    _tau : np.double, np.array, (..., nDepth)
+        optical depth, [-]
+    """
+    _tau = Integrate.Trapze_cumulative(_chi, -np.asarray(_z, dtype=np.double), axis=-1)
+
+    return _tau + np.asarray(_tau_top, dtype=np.double)[...,None]
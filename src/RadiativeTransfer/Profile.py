@@ -123,9 +123,274 @@ def Gaussian(x):
 
     return res
 
+################################################################################
+# Voigt profile for large arrays
+#    - Voigt_Humlicek : vectorized Humlicek W4 over all 4 regions
+#    - VoigtTable     : 2D (a, x) lookup table with interpolation
+################################################################################
+
+def Voigt_Humlicek(a, x):
+    r"""
+    Calculate Doppler width normalized voigt function using the
+    4 regions rational approximation (W4) of Humlicek(1982).
+
+    Unlike `Voigt`, there is no branch per element. points of each region
+    are selected by boolean masks and evaluated at once.
+
+    Parameters
+    ----------
+
+    a : np.double or array-like
+        damping constant normalized by Doppler width, [-]
+    x : np.double or array-like
+        Doppler width normalized mesh, [-]
+
+    Returns
+    -------
+
+    res : np.double or array-like
+        voigt function, normalized to 1, [-]
+
+    Notes
+    -----
+
+    The relative accuracy is better than :math:`10^{-4}` in all regions [1]_.
+
+    References
+    ----------
+
+    .. [1] J.Humlicek, 'Optimized computation of the voigt and complex probability functions',
+        Journal of Quantitative Spectroscopy and Radiative Transfer (JQSRT),
+        Volume 27, Issue 4, April 1982, Pages 437-444.
+    """
+    a, x = np.broadcast_arrays( np.asarray(a, dtype=np.double), np.asarray(x, dtype=np.double) )
+    shape = a.shape
+    a = a.ravel()
+    x = np.abs( x.ravel() )
+
+    T = a - 1j*x
+    S = x + a
+    F = np.empty(T.shape, dtype=np.complex128)
+
+    #--- region I
+    m1 = S >= 15.
+    Z = T[m1]
+    F[m1] = Z * 0.5641896 / (0.5 + Z*Z)
+
+    #--- region II
+    m2 = (S >= 5.5) & ~m1
+    Z = T[m2]
+    U = Z * Z
+    F[m2] = Z * (1.410474 + U * 0.5641896) / (0.75 + U * (3. + U))
+
+    #--- region III
+    m3 = (S < 5.5) & (a >= 0.195 * x - 0.176)
+    Z = T[m3]
+    F[m3] = ( ( 16.4955 + Z * ( 20.20933 + Z * ( 11.96482 + Z * ( 3.778987 + Z * 0.5642236 ) ) ) ) /
+              ( 16.4955 + Z * ( 38.82363 + Z * ( 39.27121 + Z * ( 21.69274 + Z * ( 6.699398 + Z ) ) ) ) ) )
+
+    #--- region IV
+    m4 = ~( m1 | m2 | m3 )
+    Z = T[m4]
+    U = Z * Z
+    F[m4] = (np.exp(U) - Z * ( 36183.31 - U * ( 3321.9905 - U * ( 1540.787 - U * ( 219.0313 - U * ( 35.76683 - U * ( 1.320522 - U * .56419 )))))) /
+             ( 32066.6 - U * ( 24322.84 - U * ( 9022.228 - U * ( 2186.181 - U * ( 364.2191 - U * ( 61.57037 - U * ( 1.841439 - U ))))))))
+
+    res = F.real.reshape(shape) / Cst.sqrtPi_
+    return res[()]
+
+def Voigt_Humlicek_scalar_(a, x):
+    r"""
+    scalar version of `Voigt_Humlicek` with one branch per region,
+    the fallback of `interpolate_Voigt_table` outside of the table.
+    """
+    x = abs(x)
+    Z = a - 1j*x
+    S = x + a
+
+    if S >= 15.:
+        #--- region I
+        F = Z * 0.5641896 / (0.5 + Z*Z)
+    elif S >= 5.5:
+        #--- region II
+        U = Z * Z
+        F = Z * (1.410474 + U * 0.5641896) / (0.75 + U * (3. + U))
+    elif a >= 0.195 * x - 0.176:
+        #--- region III
+        F = ( ( 16.4955 + Z * ( 20.20933 + Z * ( 11.96482 + Z * ( 3.778987 + Z * 0.5642236 ) ) ) ) /
+              ( 16.4955 + Z * ( 38.82363 + Z * ( 39.27121 + Z * ( 21.69274 + Z * ( 6.699398 + Z ) ) ) ) ) )
+    else:
+        #--- region IV
+        U = Z * Z
+        F = (np.exp(U) - Z * ( 36183.31 - U * ( 3321.9905 - U * ( 1540.787 - U * ( 219.0313 - U * ( 35.76683 - U * ( 1.320522 - U * .56419 )))))) /
+             ( 32066.6 - U * ( 24322.84 - U * ( 9022.228 - U * ( 2186.181 - U * ( 364.2191 - U * ( 61.57037 - U * ( 1.841439 - U ))))))))
+
+    res = F.real / Cst.sqrtPi_
+    return res
+
+def interpolate_Voigt_table(a, x, table, loga0, dloga, dx):
+    r"""
+    bilinear interpolation of a voigt table in (log10 a, |x|),
+    points outside of the table are computed by `Voigt_Humlicek_scalar_`.
+
+    Parameters
+    ----------
+
+    a : np.double, np.array, (n,)
+        damping constant normalized by Doppler width, [-]
+
+    x : np.double, np.array, (n,)
+        Doppler width normalized mesh, [-]
+
+    table : np.double, np.array, (nA, nX)
+        voigt function on the grid `loga0 + i*dloga`, `j*dx`, [-]
+
+    loga0, dloga, dx : np.double
+        first grid point in log10 a and grid spacings, [-]
+
+    Returns
+    -------
+
+    res : np.double, np.array, (n,)
+        voigt function, normalized to 1, [-]
+
+    Notes
+    -----
+
+    log10 a is only recomputed when `a` changes between consecutive points,
+    so a profile of many x at the same a costs one log10.
+    """
+    nA, nX = table.shape
+    res = np.empty(a.size, dtype=np.double)
+    a_prev = np.nan
+    fa = -1.
+    for p in range(a.size):
+        ap = a[p]
+        xp = abs(x[p])
+        fx = xp / dx
+        if ap != a_prev:
+            fa = ( np.log10(ap) - loga0 ) / dloga if ap > 0. else -1.
+            a_prev = ap
+        if fa < 0. or fa > nA-1 or fx > nX-1:
+            res[p] = Voigt_Humlicek_scalar_(ap, xp)
+            continue
+
+        i = min( int(fa), nA-2 )
+        j = min( int(fx), nX-2 )
+        ta = fa - i
+        tx = fx - j
+        res[p] = ( (1.-ta) * ( (1.-tx) * table[i,j]   + tx * table[i,j+1] ) +
+                       ta  * ( (1.-tx) * table[i+1,j] + tx * table[i+1,j+1] ) )
+
+    return res
+
+class VoigtTable:
+
+    def __init__(self, _a_min=1.E-4, _a_max=1.E+1, _dloga=0.01, _x_max=10., _dx=0.01):
+        r"""
+        initial method of class VoigtTable,
+        tabulate the Doppler width normalized voigt function on an
+        evenly spaced (log10 a, |x|) grid.
+
+        Parameters
+        ----------
+
+        _a_min, _a_max : np.double
+            range of damping constant normalized by Doppler width, [-]
+
+        _dloga : np.double
+            grid spacing in log10 a, [-]
+
+        _x_max : np.double
+            maximum of Doppler width normalized mesh, [-]
+
+        _dx : np.double
+            grid spacing in x, [-]
+
+        Notes
+        -----
+
+        The table is computed by the Faddeeva function `scipy.special.wofz`.
+        Points outside of the table are computed by `Voigt_Humlicek`.
+
+        Evaluation is fastest with `a` varying along the leading axes and
+        `x` along the last axis, e.g. a (nDepth, nLine, 1) against x (nX,).
+        """
+        from scipy.special import wofz
+
+        self.loga = np.arange(np.log10(_a_min), np.log10(_a_max)+0.5*_dloga, _dloga)
+        self.x = np.arange(0., _x_max+0.5*_dx, _dx)
+        self.dloga = _dloga
+        self.dx = _dx
+
+        self.table = wofz( self.x[None,:] + 1j * 10.**self.loga[:,None] ).real / Cst.sqrtPi_
+
+    def __call__(self, a, x):
+        r"""
+        interpolate the voigt function from the table (bilinear in log10 a and x).
+
+        Parameters
+        ----------
+
+        a : np.double or array-like
+            damping constant normalized by Doppler width, [-]
+        x : np.double or array-like
+            Doppler width normalized mesh, [-]
+
+        Returns
+        -------
+
+        res : np.double or array-like
+            voigt function, normalized to 1, [-]
+        """
+        a, x = np.broadcast_arrays( np.asarray(a, dtype=np.double), np.asarray(x, dtype=np.double) )
+        shape = a.shape
+        res = interpolate_Voigt_table( np.ascontiguousarray(a).ravel(), np.ascontiguousarray(x).ravel(),
+                                       self.table, self.loga[0], self.dloga, self.dx )
+
+        return res.reshape(shape)[()]
+
 ################################################################################
 # whether to compile them using numba's LLVM
 ################################################################################
 
 if Cst.isJIT == True:
-    Voigt = nb.vectorize( [nb.float64(nb.float64,nb.float64)],nopython=True)( Voigt )
+    target_ = "parallel" if Cst.isParallel == True else "cpu"
+    Voigt = nb.vectorize( [nb.float64(nb.float64,nb.float64)],nopython=True,target=target_)( Voigt )
+    Voigt_Humlicek_scalar_ = nb.njit( [nb.float64(nb.float64,nb.float64)] )( Voigt_Humlicek_scalar_ )
+    interpolate_Voigt_table = nb.njit( interpolate_Voigt_table )
+    Gaussian = nb.vectorize( [nb.float64(nb.float64)],nopython=True,target=target_)( Gaussian )
+
+################################################################################
+# number of threads used by the "parallel" target
+################################################################################
+
+def set_num_threads(n):
+    r"""
+    set the number of threads used by ufuncs compiled with the "parallel" target
+    (`Constants.isParallel`), clamped to [1, `numba.config.NUMBA_NUM_THREADS`].
+
+    Parameters
+    ----------
+
+    n : int
+        number of threads
+
+    Notes
+    -----
+
+    `numba.set_num_threads` is available since numba 0.49. With older numba
+    this does nothing, set the environment variable NUMBA_NUM_THREADS
+    before importing numba instead.
+    """
+    if hasattr(nb, "set_num_threads"):
+        nb.set_num_threads( max( 1, min( int(n), nb.config.NUMBA_NUM_THREADS ) ) )
+
+def get_num_threads():
+    r"""
+    return the number of threads used by ufuncs compiled with the "parallel" target.
+    """
+    if hasattr(nb, "get_num_threads"):
+        return nb.get_num_threads()
+
+    return nb.config.NUMBA_NUM_THREADS
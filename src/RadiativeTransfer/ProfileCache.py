@@ -0,0 +1,190 @@
+################################################################################
+# this file defines a cache of line profiles
+#     memoizing normalized Voigt profiles on a fixed mesh,
+#     keyed by (damping constant, Doppler width)
+################################################################################
+
+from collections import OrderedDict
+
+import numpy as np
+
+from . import Profile
+from ..Atomic import BasicP
+
+
+class ProfileCache:
+
+    def __init__(self, _mesh, _max_bytes=64*1024**2, _nDigit=8):
+        r"""
+        initial method of class ProfileCache.
+
+        Parameters
+        ----------
+
+        _mesh : np.double, np.array, (nMesh,)
+            fixed mesh of offsets from the line center,
+            frequency in any frequency unit or wavelength in any length unit
+
+        _max_bytes : int
+            memory budget of the cached profiles in bytes, default: 64 MB
+
+        _nDigit : int
+            number of significant digits of (a, Doppler width) in the key,
+            pairs agreeing to `_nDigit` digits share a cached profile, default: 8
+
+        Notes
+        -----
+
+        The least recently used profile is evicted once the budget is exceeded.
+        """
+        self.mesh = np.ascontiguousarray(_mesh, dtype=np.double)
+        self.max_bytes = int(_max_bytes)
+        self.nDigit = int(_nDigit)
+        self.max_size = max(1, self.max_bytes // self.mesh.nbytes)
+
+        self.cache = OrderedDict()
+        self.clear_stats()
+
+    def clear(self):
+        r"""
+        remove all cached profiles and reset the statistics.
+        """
+        self.cache.clear()
+        self.clear_stats()
+
+    def clear_stats(self):
+        r"""
+        reset the number of hits, misses and evictions.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, a, dD):
+        r"""
+        round (a, Doppler width) to `nDigit` significant digits.
+        """
+        return ( float( "%.*e" % (self.nDigit-1, a) ), float( "%.*e" % (self.nDigit-1, dD) ) )
+
+    def get(self, a, dD):
+        r"""
+        normalized Voigt profile on the mesh.
+
+        Parameters
+        ----------
+
+        a : np.double
+            damping constant normalized by Doppler width, [-]
+
+        dD : np.double
+            Doppler width, same unit with the mesh
+
+        Returns
+        -------
+
+        prof : np.double, np.array, (nMesh,)
+            Voigt profile normalized to 1 over the mesh unit, [1/unit of mesh].
+            read only, it is shared with the cache.
+        """
+        key = self.make_key(a, dD)
+        prof = self.cache.get(key)
+        if prof is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return prof
+
+        self.misses += 1
+        prof = Profile.Voigt(a, self.mesh / dD) / dD
+        prof.flags.writeable = False
+
+        self.cache[key] = prof
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+        return prof
+
+    def get_many(self, a, dD):
+        r"""
+        normalized Voigt profiles of many (a, Doppler width) pairs.
+
+        Parameters
+        ----------
+
+        a : np.double or array-like, (...)
+            damping constant normalized by Doppler width, [-]
+
+        dD : np.double or array-like, (...)
+            Doppler width, same unit with the mesh
+
+        Returns
+        -------
+
+        prof : np.double, np.array, (..., nMesh)
+            Voigt profile normalized to 1 over the mesh unit, [1/unit of mesh]
+        """
+        a, dD = np.broadcast_arrays( np.asarray(a, dtype=np.double), np.asarray(dD, dtype=np.double) )
+        prof = np.empty(a.shape + self.mesh.shape, dtype=np.double)
+        for idx in np.ndindex(a.shape):
+            prof[idx] = self.get(a[idx], dD[idx])
+
+        return prof
+
+    def get_line(self, a, p0, Te, Vt, am):
+        r"""
+        normalized Voigt profile on the mesh of a line,
+        with Doppler width from `BasicP.get_Doppler_width`.
+
+        Parameters
+        ----------
+
+        a : np.double
+            damping constant normalized by Doppler width, [-]
+        p0 : np.double
+            line central frequency/wavelength, same unit with the mesh
+        Te : np.double
+            Temperature, [:math:`K`]
+        Vt : np.double
+            Turbulent velocity, [:math:`cm/s`]
+        am : np.double
+            atomic mass relative to hydrogen atom. [-]
+
+        Returns
+        -------
+
+        prof : np.double, np.array, (nMesh,)
+            Voigt profile normalized to 1 over the mesh unit, [1/unit of mesh]
+        """
+        dD = BasicP.get_Doppler_width(p0, Te, Vt, am)
+
+        return self.get(a, dD)
+
+    @property
+    def hit_rate(self):
+        r"""
+        fraction of `get` calls answered by the cache.
+        """
+        n = self.hits + self.misses
+        return self.hits / n if n > 0 else 0.
+
+    def report(self):
+        r"""
+        statistics of the cache.
+
+        Returns
+        -------
+
+        stats : dict
+            "hits", "misses", "evictions", "hit_rate",
+            "size" (number of cached profiles), "max_size", "bytes", "max_bytes"
+        """
+        return {
+            "hits" : self.hits,
+            "misses" : self.misses,
+            "evictions" : self.evictions,
+            "hit_rate" : self.hit_rate,
+            "size" : len(self.cache),
+            "max_size" : self.max_size,
+            "bytes" : len(self.cache) * self.mesh.nbytes,
+            "max_bytes" : self.max_bytes,
+        }
@@ -0,0 +1,192 @@
+################################################################################
+# this file defines a frequency-by-angle quadrature of the lines of an atom
+#     for the profile weighted mean intensity J-bar and the radiative rates
+################################################################################
+
+import numpy as np
+
+from . import Profile
+from .. import Constants as Cst
+from ..Atomic import LTELib
+from ..Math import Integrate
+
+
+class LineQuadrature:
+
+    def __init__(self, _atom, _x, _dD_ref, _dD, _a=None, _nMu=4, _method="trapze"):
+        r"""
+        initial method of class LineQuadrature,
+        precompute the combined frequency-by-angle weights of all lines and depths.
+
+        Parameters
+        ----------
+
+        _atom : AtomCls.Atom
+            atom with Aji data
+
+        _x : np.double, np.array, (nX,)
+            frequency mesh of every line in unit of `_dD_ref`, [-]
+
+        _dD_ref : np.double, np.array, (nLine,)
+            reference Doppler width defining the frequency mesh, [:math:`Hz`]
+
+        _dD : np.double, np.array, (nDepth, nLine)
+            Doppler width at each depth, [:math:`Hz`]
+
+        _a : np.double, np.array, (nDepth, nLine)
+            damping constant normalized by Doppler width, [-],
+            default: None, gaussian profile
+
+        _nMu : int
+            number of Gauss-Legendre nodes of :math:`\mu` in [-1, 1], default: 4
+
+        _method : str
+            frequency quadrature, "trapze" or "simpson", default: "trapze"
+
+        Notes
+        -----
+
+        The frequency mesh of line l is fixed over depth,
+
+        .. math:: \nu_{lk} = \nu_{0,l} + x_k \Delta\nu_{D,ref,l}
+
+        and the weights
+
+        .. math:: W_{dlkm} = \phi_{dl}(\nu_{lk}) \, w_{lk} \, w_m
+
+        are normalized so that :math:`\sum_{km} W_{dlkm} = 1` for each depth and line.
+
+        `W` has nDepth * nLine * nX * nMu elements.
+        """
+        self.nLine = _atom.nLine
+        self.idxI = _atom.Line.idxI[:].astype(np.intp)
+        self.idxJ = _atom.Line.idxJ[:].astype(np.intp)
+        self.AJI = _atom.Line.AJI[:].copy()
+        self.f0 = _atom.Line.f0[:].copy()
+        gi = _atom.Level.g[self.idxI]
+        gj = _atom.Level.g[self.idxJ]
+        self.Bji, self.Bij = LTELib.EinsteinA_to_EinsteinBs_hz(self.AJI, self.f0, gi, gj)
+
+        #--- frequency mesh, (nLine, nX)
+        self.x = np.asarray(_x, dtype=np.double)
+        _dD_ref = np.asarray(_dD_ref, dtype=np.double)
+        self.nu = self.f0[:,None] + self.x[None,:] * _dD_ref[:,None]
+
+        if _method == "trapze":
+            wx = Integrate.Trapze_weights(self.x)
+        elif _method == "simpson":
+            wx = Integrate.Simpson_weights(self.x)
+        else:
+            raise ValueError("_method should be either 'trapze' or 'simpson'.")
+        self.w_nu = wx[None,:] * _dD_ref[:,None]
+
+        #--- angle mesh, (nMu,), weights sum up to 1
+        self.mu, self.w_mu = np.polynomial.legendre.leggauss(_nMu)
+        self.w_mu *= 0.5
+
+        #--- absorption profile [Hz^-1], (nDepth, nLine, nX)
+        _dD = np.asarray(_dD, dtype=np.double)[...,None]
+        v = self.x[None,None,:] * _dD_ref[None,:,None] / _dD
+        if _a is None:
+            self.phi = Profile.Gaussian(v) / _dD
+        else:
+            self.phi = Profile.Voigt(np.asarray(_a, dtype=np.double)[...,None], v) / _dD
+
+        #--- combined weights, (nDepth, nLine, nX, nMu)
+        W = self.phi * self.w_nu[None,:,:]
+        W /= W.sum(axis=-1, keepdims=True)
+        self.W = W[...,None] * self.w_mu
+
+    def get_Jbar(self, _I):
+        r"""
+        profile weighted mean intensity of all lines and depths.
+
+        Parameters
+        ----------
+
+        _I : np.double, np.array, (nDepth, nLine, nX, nMu)
+            specific intensity at `nu` and `mu`, [:math:`erg/cm^{2}/Sr/Hz/s`],
+            axes of length 1 are broadcasted, e.g. (nDepth, nLine, nX, 1) for isotropic radiation
+
+        Returns
+        -------
+
+        _Jbar : np.double, np.array, (nDepth, nLine)
+            :math:`\bar{J} = \sum_{km} W_{dlkm} I_{dlkm}`, [:math:`erg/cm^{2}/Sr/Hz/s`]
+        """
+        _I = np.broadcast_to(_I, self.W.shape)
+
+        return np.einsum("dlkm,dlkm->dl", self.W, _I, optimize=True)
+
+    def get_rates(self, _I):
+        r"""
+        radiative rates of all lines and depths, in the order of the arguments of
+        `SEsolver.setMatrixR`.
+
+        Parameters
+        ----------
+
+        _I : np.double, np.array, (nDepth, nLine, nX, nMu)
+            specific intensity at `nu` and `mu`, [:math:`erg/cm^{2}/Sr/Hz/s`]
+
+        Returns
+        -------
+
+        _Rji_spon : np.double, np.array, (nDepth, nLine)
+            spontaneous radiative transition rate, [:math:`s^{-1}`]
+
+        _Rji_stim : np.double, np.array, (nDepth, nLine)
+            stimulated radiative transition rate, :math:`B_{ji} \bar{J}`, [:math:`s^{-1}`]
+
+        _Rij : np.double, np.array, (nDepth, nLine)
+            upward radiative transition rate, :math:`B_{ij} \bar{J}`, [:math:`s^{-1}`]
+        """
+        _Jbar = self.get_Jbar(_I)
+        _Rji_spon = np.broadcast_to(self.AJI, _Jbar.shape)
+
+        return _Rji_spon, self.Bji * _Jbar, self.Bij * _Jbar
+
+    def get_line_opacity(self, _n):
+        r"""
+        line opacity on the frequency mesh of all lines and depths.
+
+        Parameters
+        ----------
+
+        _n : np.double, np.array, (nDepth, nLevel)
+            level population, [:math:`cm^{-3}`]
+
+        Returns
+        -------
+
+        _chi : np.double, np.array, (nDepth, nLine, nX)
+            :math:`\frac{h\nu_0}{4\pi}(n_i B_{ij} - n_j B_{ji}) \phi(\nu)`, [:math:`cm^{-1}`]
+        """
+        _n = np.asarray(_n, dtype=np.double)
+        _nB = _n[...,self.idxI] * self.Bij - _n[...,self.idxJ] * self.Bji
+
+        return ( Cst.h_ * self.f0 / (4. * Cst.pi_) * _nB )[...,None] * self.phi
+
+    def get_line_source_function(self, _n):
+        r"""
+        line source function of all lines and depths, complete redistribution.
+
+        Parameters
+        ----------
+
+        _n : np.double, np.array, (nDepth, nLevel)
+            level population, [:math:`cm^{-3}`]
+
+        Returns
+        -------
+
+        _S : np.double, np.array, (nDepth, nLine)
+            :math:`\frac{n_j A_{ji}}{n_i B_{ij} - n_j B_{ji}}`, [:math:`erg/cm^{2}/Sr/Hz/s`]
+        """
+        _n = np.asarray(_n, dtype=np.double)
+        _nB = _n[...,self.idxI] * self.Bij - _n[...,self.idxJ] * self.Bji
+
+        _nA = _n[...,self.idxJ] * self.AJI
+
+        #--- 0 for transitions without Aji data
+        return np.divide(_nA, _nB, out=np.zeros_like(_nA), where=_nB != 0.)
@@ -0,0 +1,259 @@
+################################################################################
+# this file defines the short characteristics formal solver
+#     of a plane-parallel atmosphere (Olson & Kunasz 1987),
+#     sweeping depth for all frequencies and angles at once
+################################################################################
+
+import numpy as np
+
+
+################################################################################
+# interpolation coefficients of the source function along a short characteristic
+################################################################################
+
+def get_exp_moments(_dt):
+    r"""
+    exponential moments of an optical depth interval :math:`\Delta`,
+
+    .. math:: e_0 = 1 - e^{-\Delta}, \quad e_1 = \Delta - e_0, \quad e_2 = \Delta^2 - 2 e_1
+
+    Parameters
+    ----------
+
+    _dt : np.double, np.array
+        optical depth interval along the ray, >= 0
+
+    Returns
+    -------
+
+    _ex, _e0, _e1, _e2 : np.double, np.array
+        :math:`e^{-\Delta}` and the moments,
+        Taylor series are used for small :math:`\Delta` to avoid cancellation
+    """
+    _ex = np.exp(-_dt)
+    _e0 = -np.expm1(-_dt)
+    _e1 = _dt - _e0
+    _e2 = _dt * _dt - 2. * _e1
+
+    small = _dt < 1.E-2
+    if small.any():
+        d = _dt[small]
+        _e1[small] = d*d * ( 1./2. - d * ( 1./6. - d * ( 1./24. - d / 120. ) ) )
+        _e2[small] = d*d*d * ( 1./3. - d * ( 1./12. - d * ( 1./60. - d / 360. ) ) )
+
+    return _ex, _e0, _e1, _e2
+
+def get_exp_ratios(_dt, _e0, _e1, _e2):
+    r"""
+    ratios of the exponential moments that stay finite as :math:`\Delta \to 0`,
+
+    .. math:: q = e_1 / \Delta, \quad r = (\Delta e_1 - e_2) / \Delta^2
+
+    Parameters
+    ----------
+
+    _dt : np.double, np.array
+        optical depth interval along the ray, >= 0
+
+    _e0, _e1, _e2 : np.double, np.array
+        exponential moments from `get_exp_moments`
+
+    Returns
+    -------
+
+    _q, _r : np.double, np.array
+        the ratios, Taylor series are used for small :math:`\Delta`,
+        :math:`q \to \Delta/2, r \to \Delta/6`
+    """
+    small = _dt < 1.E-2
+    d = np.where(small, 1., _dt)
+    _q = _e1 / d
+    _r = (d * _e1 - _e2) / (d * d)
+
+    if small.any():
+        d = _dt[small]
+        _q[small] = d * ( 1./2. - d * ( 1./6. - d * ( 1./24. - d * ( 1./120. - d / 720. ) ) ) )
+        _r[small] = d * ( 1./6. - d * ( 1./12. - d * ( 1./40. - d * ( 1./180. - d / 1008. ) ) ) )
+
+    return _q, _r
+
+def get_psi_linear(_du):
+    r"""
+    weights of the upwind and local source function, linear interpolation.
+
+    Parameters
+    ----------
+
+    _du : np.double, np.array
+        upwind optical depth interval along the ray
+
+    Returns
+    -------
+
+    _ex, _psi_u, _psi_0 : np.double, np.array
+        :math:`e^{-\Delta_u}` and the weights
+    """
+    _ex, _e0, _e1, _e2 = get_exp_moments(_du)
+    _psi_0, _ = get_exp_ratios(_du, _e0, _e1, _e2)
+
+    return _ex, _e0 - _psi_0, _psi_0
+
+def get_psi_parabolic(_du, _dd):
+    r"""
+    weights of the upwind, local and downwind source function, parabolic interpolation.
+
+    Parameters
+    ----------
+
+    _du : np.double, np.array
+        upwind optical depth interval along the ray
+
+    _dd : np.double, np.array
+        downwind optical depth interval along the ray
+
+    Returns
+    -------
+
+    _ex, _psi_u, _psi_0, _psi_d : np.double, np.array
+        :math:`e^{-\Delta_u}` and the weights, Equation(7a-7c) of [1]_.
+        the linear weights are used where :math:`\Delta_d = 0`
+
+    References
+    ----------
+
+    .. [1] G.L. Olson, P.B. Kunasz, "Short characteristic solution of the non-LTE
+        line transfer problem by operator perturbation--I. The one-dimensional planar slab",
+        Journal of Quantitative Spectroscopy and Radiative Transfer (JQSRT),
+        Volume 38, Issue 5, 1987, Pages 325-336.
+    """
+    _ex, _e0, _e1, _e2 = get_exp_moments(_du)
+    _q, _r = get_exp_ratios(_du, _e0, _e1, _e2)
+
+    #--- Equation(7a-7c) rewritten without dividing by _du
+    flat = _dd <= 0.
+    dd = np.where(flat, 1., _dd)
+    rs = np.where(flat, 0., _r * _du / (_du + dd))
+    _psi_u = _e0 - _q - rs
+    _psi_0 = _q + np.where(flat, 0., _r * _du / dd)
+    _psi_d = - rs * _du / dd
+
+    return _ex, _psi_u, _psi_0, _psi_d
+
+################################################################################
+# formal solver
+################################################################################
+
+def solve_SC(_tau, _S, _mu, _I_top=0., _I_bottom=None, _order=2):
+    r"""
+    short characteristics formal solution for all frequencies and angles.
+
+    Parameters
+    ----------
+
+    _tau : np.double, np.array, (nDepth, ...)
+        vertical optical depth, increasing with depth index, [-]
+
+    _S : np.double, np.array, (nDepth, ...)
+        source function
+
+    _mu : np.double, np.array, (nMu,)
+        cosine of the angle to the outward normal,
+        > 0 for outgoing rays, < 0 for incoming rays
+
+    _I_top : np.double or np.array, broadcastable to (..., nMu)
+        incident intensity at the top for incoming rays, default: 0
+
+    _I_bottom : np.double or np.array, broadcastable to (..., nMu)
+        incident intensity at the bottom for outgoing rays,
+        default: None, thermalized, I = S at the last depth point
+
+    _order : int
+        1 : linear, 2 : parabolic (Olson & Kunasz) interpolation of S, default: 2
+
+    Returns
+    -------
+
+    _I : np.double, np.array, (nDepth, ..., nMu)
+        specific intensity, same unit with `_S`
+
+    _Lstar : np.double, np.array, (nDepth, ..., nMu)
+        diagonal of the Lambda operator of each ray, :math:`\partial I_i / \partial S_i`
+
+    Notes
+    -----
+
+    The depth axis is the leading axis so that each step of the sweep works on
+    one contiguous slice of all frequencies and angles. With frequencies of
+    `LineQuadrature`, `_tau` is (nDepth, nLine, nX) and `_I` can be passed
+    to `LineQuadrature.get_Jbar` directly.
+
+    Along the ray, with upwind point u and downwind point d,
+
+    .. math:: I_i = I_u e^{-\Delta_u} + \psi_u S_u + \psi_0 S_i + \psi_d S_d
+
+    The last point of each sweep uses the linear interpolation.
+    """
+    _tau = np.asarray(_tau, dtype=np.double)
+    _S = np.broadcast_to(_S, _tau.shape)
+    _mu = np.asarray(_mu, dtype=np.double)
+    nDepth = _tau.shape[0]
+    assert nDepth >= 2, "at least 2 depth points are required."
+    assert (_mu != 0.).all(), "_mu should not be 0."
+
+    shape = _tau.shape + _mu.shape
+    _I = np.empty(shape, dtype=np.double)
+    _Lstar = np.empty(shape, dtype=np.double)
+
+    dtau = np.diff(_tau, axis=0)[...,None]                   # (nDepth-1, ..., 1)
+
+    for outgoing in (True, False):
+        sel = _mu > 0. if outgoing else _mu < 0.
+        if not sel.any():
+            continue
+        amu = np.abs(_mu[sel])
+
+        if outgoing:
+            seq = range(nDepth-1, -1, -1)
+            I_in = _I_bottom
+        else:
+            seq = range(nDepth)
+            I_in = _I_top
+
+        #--- boundary
+        i0 = seq[0]
+        if I_in is None:
+            I = np.broadcast_to(_S[i0][...,None], shape[1:-1] + (amu.size,)).copy()
+            L = np.ones_like(I)
+        else:
+            I = np.broadcast_to( np.asarray(I_in, dtype=np.double)[...,sel] if np.ndim(I_in) > 0 else I_in,
+                                 shape[1:-1] + (amu.size,) ).copy()
+            L = np.zeros_like(I)
+        _I[i0][...,sel] = I
+        _Lstar[i0][...,sel] = L
+        psi_d_prev = 0.
+
+        #--- sweep
+        for n in range(1, nDepth):
+            i = seq[n]
+            u = seq[n-1]
+            du = dtau[min(i,u)] / amu
+            S_u = _S[u][...,None]
+            S_0 = _S[i][...,None]
+
+            if _order == 2 and n < nDepth-1:
+                d = seq[n+1]
+                dd = dtau[min(i,d)] / amu
+                ex, psi_u, psi_0, psi_d = get_psi_parabolic(du, dd)
+                I = I * ex + psi_u * S_u + psi_0 * S_0 + psi_d * _S[d][...,None]
+            else:
+                ex, psi_u, psi_0 = get_psi_linear(du)
+                psi_d = 0.
+                I = I * ex + psi_u * S_u + psi_0 * S_0
+
+            L = psi_0 + ex * psi_d_prev
+            psi_d_prev = psi_d
+
+            _I[i][...,sel] = I
+            _Lstar[i][...,sel] = L
+
+    return _I, _Lstar
@@ -1,4 +1,5 @@
 import numpy as np
+import numba as nb
 from .. import Constants as Cst
 
 def get_relative_flux(_AJI, _f0, _nj):
@@ -53,3 +54,174 @@ def get_relative_flux(_AJI, _f0, _nj):
     _rf = Cst.h_ * _f0[:] * _nj[:] * _AJI[:]
 
     return _rf
+
+def Bsp_eval(_Bsp_t, _Bsp_c, _Bsp_k, _x):
+    r"""
+    evaluate B-splines sharing the same knots at a scalar point
+    using de Boor's algorithm.
+
+    Parameters
+    ----------
+
+    _Bsp_t : np.double, np.array, (nKnot,)
+        knots of the B-spline
+
+    _Bsp_c : np.double, np.array, (nLine, nCoe)
+        B-spline coefficients of each transition
+
+    _Bsp_k : int
+        degree of the B-spline, [-]
+
+    _x : np.double
+        point to evaluate, clipped into the base interval [t[k], t[nCoe]]
+
+    Returns
+    -------
+
+    _res : np.double, np.array, (nLine,)
+        value of each B-spline at `_x`
+    """
+    _nLine, _nCoe = _Bsp_c.shape
+    _x = min( max( _x, _Bsp_t[_Bsp_k] ), _Bsp_t[_nCoe] )
+
+    #--- find the knot interval t[l] <= x < t[l+1]
+    _l = _Bsp_k
+    while _l < _nCoe-1 and _x >= _Bsp_t[_l+1]:
+        _l += 1
+
+    _res = np.empty(_nLine, dtype=np.double)
+    _d = np.empty(_Bsp_k+1, dtype=np.double)
+    for _m in range(_nLine):
+        for _j in range(_Bsp_k+1):
+            _d[_j] = _Bsp_c[_m, _j+_l-_Bsp_k]
+        for _r in range(1, _Bsp_k+1):
+            for _j in range(_Bsp_k, _r-1, -1):
+                _alpha = (_x - _Bsp_t[_j+_l-_Bsp_k]) / (_Bsp_t[_j+1+_l-_r] - _Bsp_t[_j+_l-_Bsp_k])
+                _d[_j] = (1.0 - _alpha) * _d[_j-1] + _alpha * _d[_j]
+        _res[_m] = _d[_Bsp_k]
+
+    return _res
+
+def get_SE_relative_flux(_erg, _g, _stage, _AJI, _f0, _idxI, _idxJ,
+                         _CE_idxI, _CE_idxJ, _Bsp_t, _Bsp_c, _Bsp_k, _f1, _f2, _Te, _Ne):
+    r"""
+    compute statistical equilibrium level population and optically thin relative flux
+    for each (Te, Ne) point, from LTE population, collisional excitation
+    and spontaneous emission, in a single kernel.
+
+    Parameters
+    ----------
+
+    _erg : np.double, np.array, (nLevel,)
+        level energy relative to 1st level, [:math:`erg`]
+
+    _g : np.uint8, np.array, (nLevel,)
+        statistical weight, [-]
+
+    _stage : np.uint8, np.array, (nLevel,)
+        ionization stage, [-]
+
+    _AJI : np.double, np.array, (nLine,)
+        Einstein A coefficient, [:math:`s^{-1}`]
+
+    _f0 : np.double, np.array, (nLine,)
+        Transition line frequency, [:math:`hz`]
+
+    _idxI, _idxJ : np.uint16, np.array, (nLine,)
+        level index of lower/upper level of each radiative transition, [-]
+
+    _CE_idxI, _CE_idxJ : np.uint16, np.array, (nTran,)
+        level index of lower/upper level of each collisional transition, [-]
+
+    _Bsp_t, _Bsp_c, _Bsp_k :
+        pre-fitted B-spline of Effective Collisional Strength,
+        `Atom.CE_Bsp_t`, `Atom.CE_Bsp_c`, `Atom.CE_Bsp_k`
+
+    _f1, _f2 : np.uint8, np.array, (nTran,)
+        factors needed to compute CE rate coefficient
+
+    _Te : np.double, np.array, (nPoint,)
+        electron temperature, [:math:`K`]
+
+    _Ne : np.double, np.array, (nPoint,)
+        electron density, [:math:`cm^{-3}`]
+
+    Returns
+    -------
+
+    _nArr : np.double, np.array, (nPoint, nLevel)
+        normalized level population. [-]
+
+    _rf : np.double, np.array, (nPoint, nLine)
+        relative flux under the assumption of optically thin. [:math:`erg \; s^{-1}`]
+
+    Notes
+    -----
+
+    Same as the sequence
+
+    `LTELib.get_LTE_ratio` --> `ColExcite.interpolate_CE_fac_Bsp` --> `ColExcite.get_CE_rate_coe` ("ECS")
+    --> `ColExcite.Cij_to_Cji` --> `SEsolver.setMatrixC`, `SEsolver.setMatrixR` --> `SEsolver.solveSE`
+    --> `get_relative_flux`
+
+    with zero radiative excitation and stimulated emission,
+    written with explicit loops so that it compiles with numba's nopython mode.
+    """
+    _nPoint = _Te.size
+    _nLevel = _erg.size
+    _nLine = _AJI.size
+    _nTran = _f1.size
+
+    _nArr = np.empty((_nPoint, _nLevel), dtype=np.double)
+    _rf = np.empty((_nPoint, _nLine), dtype=np.double)
+    _nLTE = np.empty(_nLevel, dtype=np.double)
+    _A = np.empty((_nLevel, _nLevel), dtype=np.double)
+    _b = np.zeros(_nLevel, dtype=np.double)
+    _b[-1] = 1.
+
+    for _p in range(_nPoint):
+        _T = _Te[_p]
+        _kT = Cst.k_ * _T
+
+        #--- LTE population ratio
+        _nLTE[0] = 1.
+        for _i in range(1, _nLevel):
+            _rt = (_g[_i] / _g[_i-1]) * np.exp( -(_erg[_i]-_erg[_i-1]) / _kT )
+            if int(_stage[_i]) - int(_stage[_i-1]) == 1:
+                _rt *= Cst.saha_ * _T**(1.5) / _Ne[_p]
+            _nLTE[_i] = _nLTE[_i-1] * _rt
+
+        #--- rate matrix
+        _A[:,:] = 0.
+        for _k in range(_nLine):
+            _A[_idxI[_k], _idxJ[_k]] += _AJI[_k]
+
+        _CE_fac = Bsp_eval(_Bsp_t, _Bsp_c, _Bsp_k, _T)
+        for _k in range(_nTran):
+            _i, _j = _CE_idxI[_k], _CE_idxJ[_k]
+            _CEij = (8.63E-06 * _CE_fac[_k] * _f1[_k] / _f2[_k]) / (_g[_i] * _T**0.5) * np.exp( -(_erg[_j]-_erg[_i]) / _kT )
+            _CEji = _CEij * _nLTE[_i] / _nLTE[_j]
+            _A[_i, _j] += _Ne[_p] * _CEji
+            _A[_j, _i] += _Ne[_p] * _CEij
+
+        #--- diagnal components and abundance definition equation
+        for _k in range(_nLevel):
+            _A[_k,_k] = 0.
+            _A[_k,_k] = -_A[:,_k].sum()
+        _A[-1,:] = 1.
+
+        _nArr[_p,:] = np.linalg.solve(_A, _b)
+
+        #--- optically thin relative flux
+        for _k in range(_nLine):
+            _rf[_p,_k] = Cst.h_ * _f0[_k] * _nArr[_p,_idxJ[_k]] * _AJI[_k]
+
+    return _nArr, _rf
+
+################################################################################
+# whether to compile them using numba's LLVM
+################################################################################
+
+if Cst.isJIT == True:
+    Bsp_eval = nb.njit( Bsp_eval )
+    get_SE_relative_flux = nb.njit( get_SE_relative_flux )
@@ -1,11 +1,13 @@
 
+import os
 import numpy as np
 from .. import Constants as Cst
 from . import AtomIO
+from ..Atomic import ColExcite, BasicP
 
 class Atom:
 
-    def __init__(self, _filepath, _file_Aji=None, _file_CEe=None, _file_CEp=None):
+    def __init__(self, _filepath, _file_Aji=None, _file_CEe=None, _file_CEp=None, _cache_dir=None, _sparse=False):
         r"""
         initial method of class Atom.
 
@@ -23,7 +25,28 @@ class Atom:
 
         _file_CEp : str
             path (and filename) to Proton impact Effective Collisional Strength data file *.Proton, default: None
+
+        _cache_dir : str
+            directory of binary cache files *.npz, default: None.
+            if given, the parsed atomic model is read from/saved to a cache file
+            keyed by the paths and modification times of the data files above.
+
+        _sparse : bool
+            whether to keep only the transitions listed in the data files, default: False.
+            if True, `Line` holds the transitions with Aji > 0 and `CE_coe`, `CE_table`
+            the transitions with CE data, so that memory scales with the number of
+            transitions with data instead of nLevel^2.
+            otherwise `Line` and `CE_coe` hold all nLevel*(nLevel-1)/2 pairs.
         """
+        self.sparse = _sparse
+
+        if _cache_dir is not None:
+            _cache_path = AtomIO.get_cache_path(_cache_dir, (_filepath, _file_Aji, _file_CEe, _file_CEp),
+                                                _tag="atom_sparse" if _sparse else "atom")
+            if os.path.isfile(_cache_path):
+                self.read_cache(_cache_path)
+                return
+
         self.filepath_dict = {
             "config" : _filepath,
 
@@ -39,6 +62,10 @@ class Atom:
         if _file_CEe is not None:
             self.read_CE(_file_CEe, _file_CEp)
 
+        if _cache_dir is not None:
+            os.makedirs(_cache_dir, exist_ok=True)
+            self.save_cache(_cache_path)
+
 
     def __read_Level(self):
         r"""
@@ -50,7 +77,8 @@ class Atom:
 
         #--- read general info
         rs, self.Title, self.Z, self.Element, self.nLevel = AtomIO.read_general_info(_rs=0, _lns=fLines)
-        self.nLine = self.nLevel * (self.nLevel-1) // 2
+        # in sparse mode, nLine is set by `read_Aji`
+        self.nLine = 0 if self.sparse else self.nLevel * (self.nLevel-1) // 2
 
         #--- read Level info
         dtype  = np.dtype([
@@ -65,6 +93,14 @@ class Atom:
         self.Level.erg[:] *= Cst.eV2erg_
 
         #--- make tuple of tuple (configuration, term, J)
+        self.__make_level_info_table()
+
+    def __make_level_info_table(self):
+        r"""
+        make tuple of tuple (configuration, term, J) and
+        a hash dictionary for mapping ctj --> level idx
+        """
+
         self.Level_info_table = []
         for k in range(self.nLevel):
             self.Level_info_table.append((self.Level_info["configuration"][k],
@@ -72,25 +108,39 @@ class Atom:
                                           self.Level_info["J"][k]))
         self.Level_info_table = tuple(self.Level_info_table)
 
+        self.Level_info_dict = { _ctj : k for k, _ctj in enumerate(self.Level_info_table) }
+
     def __make_line_idx_ctj_table(self):
         r"""
-        make a hash dictionary for mapping
+        make tables and hash dictionaries for mapping
 
-        (ctj_i, ctj_j) --> (idxI, idxJ)
+        (ctj_i, ctj_j) <--> (idxI, idxJ) <--> line index (line No.)
+
+        in sparse mode, only the transitions in `Line` are included.
         """
 
+        if self.sparse:
+            if hasattr(self, "Line"):
+                _pairs = zip( self.Line.idxI[:].tolist(), self.Line.idxJ[:].tolist() )
+            else:
+                _pairs = ()
+        else:
+            _pairs = ( (i, j) for i in range(0, self.nLevel) for j in range(i+1, self.nLevel) )
+
         Line_idx_table = []
         Line_ctj_table = []
-        for i in range(0, self.nLevel):
-            for j in range(i+1, self.nLevel):
-                # i : lower level
-                # j : upper level
-                Line_idx_table.append( ( i, j ) )
-                Line_ctj_table.append( ( self.Level_info_table[i], self.Level_info_table[j] ) )
+        for i, j in _pairs:
+            # i : lower level
+            # j : upper level
+            Line_idx_table.append( ( i, j ) )
+            Line_ctj_table.append( ( self.Level_info_table[i], self.Level_info_table[j] ) )
 
         self.Line_idx_table = tuple( Line_idx_table )
         self.Line_ctj_table = tuple( Line_ctj_table )
 
+        self.Line_idx_dict = { _idx : k for k, _idx in enumerate(self.Line_idx_table) }
+        self.Line_ctj_dict = { _ctj : k for k, _ctj in enumerate(self.Line_ctj_table) }
+
     def read_Aji(self, _path):
         r"""
         read Aji information from *.Aji
@@ -117,17 +167,27 @@ class Atom:
                            ('w0',np.double),            #: central wavelength in cm
                            ('w0_AA',np.double),         #: central wavelength in Angstrom
                            ])
-        self.Line = np.recarray(self.nLine, dtype=dtype)
-        # idxI and idxJ
-        idx = 0
-        for i in range(0, self.nLevel):
-            for j in range(i+1, self.nLevel):
-                self.Line.idxI[idx], self.Line.idxJ[idx] = i, j
-                idx += 1
-        del idx    # for safety
-        self.Line.AJI[:] = 0
-
-        AtomIO.read_line_info(_lns=fLines, _Aji=self.Line.AJI[:], _line_ctj_table=self.Line_ctj_table)
+        if self.sparse:
+            # only transitions with Aji > 0, sorted by (idxI, idxJ)
+            _pairs = AtomIO.read_line_pairs(_lns=fLines, _level_info_dict=self.Level_info_dict)
+            _pairs = sorted( (_idx, _Aji) for _idx, _Aji in _pairs.items() if _Aji > 0 )
+            self.nLine = len(_pairs)
+            self.Line = np.recarray(self.nLine, dtype=dtype)
+            for k, ((i, j), _Aji) in enumerate(_pairs):
+                self.Line.idxI[k], self.Line.idxJ[k], self.Line.AJI[k] = i, j, _Aji
+            self.__make_line_idx_ctj_table()
+        else:
+            self.Line = np.recarray(self.nLine, dtype=dtype)
+            # idxI and idxJ
+            idx = 0
+            for i in range(0, self.nLevel):
+                for j in range(i+1, self.nLevel):
+                    self.Line.idxI[idx], self.Line.idxJ[idx] = i, j
+                    idx += 1
+            del idx    # for safety
+            self.Line.AJI[:] = 0
+
+            AtomIO.read_line_info(_lns=fLines, _Aji=self.Line.AJI[:], _line_ctj_dict=self.Line_ctj_dict)
 
         # calculate f0, w0, w0_AA
         for k in range(self.nLine):
@@ -167,10 +227,9 @@ class Atom:
         # read Temperature grid for interpolation
         rs, nTe, Te, self.CE_type = AtomIO.read_CE_Temperature(_lns=fLines)
         self.CE_Te_table = np.array(Te, dtype=np.double)
-        self.CE_table = np.zeros((self.nLine, nTe), dtype=np.double)
         dtype  = np.dtype([
-                          ('idxI',np.uint8),      #: level index, the Level index of lower level
-                          ('idxJ',np.uint8),      #: level index, the Level index of lower level
+                          ('idxI',np.uint16),     #: level index, the Level index of lower level
+                          ('idxJ',np.uint16),     #: level index, the Level index of lower level
                           ('f1',np.uint8),        #: a factor for ESC calculation due to fine structure, \Omega * f1 / f2
                           ('f2',np.uint8),        #: a factor for ESC calculation due to fine structure, \Omega * f1 / f2
                           ('gi',np.uint8),        #: statistical weight of lower level
@@ -178,25 +237,42 @@ class Atom:
                           ('dEij',np.double)      #: excitation energy, [:math:`erg`]
                           ])
 
-        self.CE_coe = np.recarray(self.nLine, dtype=dtype)
-
-        # idxI and idxJ
-        idx = 0
-        for i in range(0, self.nLevel):
-            for j in range(i+1, self.nLevel):
-                self.CE_coe.idxI[idx], self.CE_coe.idxJ[idx] = i, j
-                idx += 1
-        del idx    # for safety
-
-        # read CE_table
-        AtomIO.read_CE_table(_rs=rs, _lns=fLines, _CE_table=self.CE_table,
-                _f1=self.CE_coe.f1[:], _f2=self.CE_coe.f2[:], _line_ctj_table=self.Line_ctj_table)
-
-        for k in range(self.nLine):
+        if self.sparse:
+            # only transitions with CE data, sorted by (idxI, idxJ)
+            _pairs = sorted( AtomIO.read_CE_pairs(_rs=rs, _lns=fLines, _level_info_dict=self.Level_info_dict).items() )
+            nTran = len(_pairs)
+            self.CE_table = np.zeros((nTran, nTe), dtype=np.double)
+            self.CE_coe = np.recarray(nTran, dtype=dtype)
+            for k, ((i, j), (_row, _f1, _f2)) in enumerate(_pairs):
+                self.CE_coe.idxI[k], self.CE_coe.idxJ[k] = i, j
+                self.CE_coe.f1[k], self.CE_coe.f2[k] = _f1, _f2
+                self.CE_table[k,:] = _row
+        else:
+            nTran = self.nLine
+            self.CE_table = np.zeros((nTran, nTe), dtype=np.double)
+            self.CE_coe = np.recarray(nTran, dtype=dtype)
+
+            # idxI and idxJ
+            idx = 0
+            for i in range(0, self.nLevel):
+                for j in range(i+1, self.nLevel):
+                    self.CE_coe.idxI[idx], self.CE_coe.idxJ[idx] = i, j
+                    idx += 1
+            del idx    # for safety
+
+            # read CE_table
+            AtomIO.read_CE_table(_rs=rs, _lns=fLines, _CE_table=self.CE_table,
+                    _f1=self.CE_coe.f1[:], _f2=self.CE_coe.f2[:], _line_ctj_dict=self.Line_ctj_dict)
+
+        for k in range(nTran):
             self.CE_coe.gi[k] = self.Level.g[self.CE_coe.idxI[k]]
             self.CE_coe.gj[k] = self.Level.g[self.CE_coe.idxJ[k]]
             self.CE_coe.dEij[k] = self.Level.erg[self.CE_coe.idxJ[k]] - self.Level.erg[self.CE_coe.idxI[k]]
 
+        # fit B-spline of CE_table once, for interpolation in temperature
+        self.CE_Bsp_t, self.CE_Bsp_c, self.CE_Bsp_k = ColExcite.get_CE_Bsp_cached(
+                _table=self.CE_table[:,:], _Te_table=self.CE_Te_table[:])
+
         print("Finished.")
         print()
 
@@ -216,12 +292,94 @@ class Atom:
 
             pass
 
+    def save_cache(self, _path):
+        r"""
+        save the parsed atomic model to a binary cache file *.npz
+
+        Parameters
+        ----------
+
+        _path : str
+            path to *.npz cache file
+        """
+
+        _data = {
+            "Title" : self.Title, "Z" : self.Z, "Element" : self.Element, "nLevel" : self.nLevel,
+            "sparse" : self.sparse,
+            "filepath_keys" : list( self.filepath_dict.keys() ),
+            "filepath_values" : list( self.filepath_dict.values() ),
+            "Level" : self.Level,
+        }
+        for _key, _value in self.Level_info.items():
+            _data["Level_info:" + _key] = _value
+
+        if hasattr(self, "Line"):
+            _data["Line"] = self.Line
+
+        if hasattr(self, "CE_table"):
+            _data.update({
+                "CE_type" : self.CE_type, "CE_Te_table" : self.CE_Te_table,
+                "CE_table" : self.CE_table, "CE_coe" : self.CE_coe,
+                "CE_Bsp_t" : self.CE_Bsp_t, "CE_Bsp_c" : self.CE_Bsp_c, "CE_Bsp_k" : self.CE_Bsp_k,
+            })
+
+        # write to a temporary file first, so that concurrent processes never read a partial cache
+        _path_tmp = "{}.{}.tmp".format(_path, os.getpid())
+        with open(_path_tmp, 'wb') as file:
+            np.savez(file, **_data)
+        os.replace(_path_tmp, _path)
+
+    def read_cache(self, _path):
+        r"""
+        read the parsed atomic model from a binary cache file *.npz,
+        without touching the text parser in AtomIO.
+
+        Parameters
+        ----------
+
+        _path : str
+            path to *.npz cache file
+        """
+
+        with np.load(_path) as _data:
+
+            self.Title = str( _data["Title"] )
+            self.Z = str( _data["Z"] )
+            self.Element = str( _data["Element"] )
+            self.nLevel = int( _data["nLevel"] )
+            self.sparse = bool( _data["sparse"] ) if "sparse" in _data.files else False
+            self.nLine = 0 if self.sparse else self.nLevel * (self.nLevel-1) // 2
+            self.filepath_dict = dict( zip( _data["filepath_keys"].tolist(), _data["filepath_values"].tolist() ) )
+
+            self.Level = _data["Level"].view(np.recarray)
+            self.Level_info = {}
+            for _key in ("configuration", "term", "J", "2S+1"):
+                self.Level_info[_key] = _data["Level_info:" + _key].tolist()
+
+            if "Line" in _data.files:
+                self.Line = _data["Line"].view(np.recarray)
+                self.nLine = self.Line.shape[0]
+
+            if "CE_table" in _data.files:
+                self.CE_type = str( _data["CE_type"] )
+                self.CE_Te_table = _data["CE_Te_table"]
+                self.CE_table = _data["CE_table"]
+                self.CE_coe = _data["CE_coe"].view(np.recarray)
+                self.CE_Bsp_t = _data["CE_Bsp_t"]
+                self.CE_Bsp_c = _data["CE_Bsp_c"]
+                self.CE_Bsp_k = int( _data["CE_Bsp_k"] )
+                ColExcite.set_CE_Bsp_cache(self.CE_table, self.CE_Te_table,
+                                           (self.CE_Bsp_t, self.CE_Bsp_c, self.CE_Bsp_k))
+
+        self.__make_level_info_table()
+        self.__make_line_idx_ctj_table()
+
     def ctj_to_level_idx(self, ctj):
         r"""
         ctj --> idx
         """
 
-        return self.Level_info_table.index(ctj)
+        return self.Level_info_dict[ctj]
 
     def level_idx_to_ctj(self, idx):
         r"""
@@ -235,14 +393,14 @@ class Atom:
         (ctj_i, ctj_j) --> (idxI, idxJ)
         """
 
-        return self.Line_idx_table[ self.Line_ctj_table.index( line_ctj ) ]
+        return self.Line_idx_table[ self.Line_ctj_dict[ line_ctj ] ]
 
     def line_idx_to_line_ctj(self, line_idx):
         r"""
         (idxI, idxJ) --> (ctj_i, ctj_j)
         """
 
-        return self.Line_ctj_table[ self.Line_idx_table.index( line_idx ) ]
+        return self.Line_ctj_table[ self.Line_idx_dict[ line_idx ] ]
 
     def line_index_to_line_ctj(self, _index):
         r"""
@@ -256,7 +414,7 @@ class Atom:
         (ctj_i, ctj_j) --> line index (line No.)
         """
 
-        return self.Line_ctj_table.index(line_ctj)
+        return self.Line_ctj_dict[line_ctj]
 
     def line_index_to_line_idx(self, _index):
         r"""
@@ -270,7 +428,7 @@ class Atom:
         (idxI, idxJ) --> line index (line No.)
         """
 
-        return self.Line_idx_table.index(line_idx)
+        return self.Line_idx_dict[line_idx]
 
     def conf_to_line_idx(self, conf_lower, conf_upper):
         r"""
@@ -284,3 +442,64 @@ class Atom:
         """
         _line_ctj = ( conf_lower, conf_upper )
         return self.line_ctj_to_line_index( _line_ctj )
+
+    def get_Doppler_width(self, _Te, _Vt, _am):
+        r"""
+        Doppler width in frequency of all lines, see `BasicP.get_Doppler_width`.
+
+        Parameters
+        ----------
+
+        _Te : np.double or array-like, (...)
+            Temperature, [:math:`K`]
+        _Vt : np.double or array-like, (...)
+            Turbulent velocity, [:math:`cm/s`]
+        _am : np.double
+            atomic mass relative to hydrogen atom. [-]
+
+        Returns
+        -------
+
+        _dD : np.double, np.array, (..., nLine)
+            Doppler width in frequency, [:math:`Hz`]
+        """
+        _Te = np.asarray(_Te, dtype=np.double)[...,None]
+        _Vt = np.asarray(_Vt, dtype=np.double)[...,None]
+
+        return BasicP.get_Doppler_width(self.Line.f0[:], _Te, _Vt, _am)
+
+    def make_freq_mesh(self, _Te, _Vt, _am, _x_max=5., _nX=41):
+        r"""
+        frequency mesh of all lines packed into one flat array,
+        see `BasicP.make_packed_mesh`.
+
+        Parameters
+        ----------
+
+        _Te : np.double or array-like, (nLine,)
+            reference temperature defining the Doppler width of the mesh, [:math:`K`]
+        _Vt : np.double or array-like, (nLine,)
+            reference turbulent velocity defining the Doppler width of the mesh, [:math:`cm/s`]
+        _am : np.double
+            atomic mass relative to hydrogen atom. [-]
+        _x_max : np.double or array-like, (nLine,)
+            half width of the mesh in unit of the reference Doppler width, default: 5
+        _nX : int or array-like of int, (nLine,)
+            number of mesh points of each line, default: 41
+
+        Returns
+        -------
+
+        _offsets : np.intp, np.array, (nLine+1,)
+            mesh of line k is `_f[_offsets[k]:_offsets[k+1]]`
+        _line : np.intp, np.array, (nTot,)
+            line index of each mesh point
+        _x : np.double, np.array, (nTot,)
+            mesh normalized by the reference Doppler width, [-]
+        _f : np.double, np.array, (nTot,)
+            frequency mesh, [:math:`Hz`]
+        """
+        _dD = BasicP.get_Doppler_width(self.Line.f0[:], _Te, _Vt, _am)
+        _dD = np.broadcast_to(_dD, (self.nLine,))
+
+        return BasicP.make_packed_mesh(self.Line.f0[:], _dD, _x_max, _nX)
@@ -1,3 +1,6 @@
+import os
+import hashlib
+
 
 def skip_line(_ln):
     r"""
@@ -91,7 +94,7 @@ def read_level_info(_rs, _lns, _Level_info, _erg, _g, _stage):
 
     return _re
 
-def read_line_info(_lns, _Aji, _line_ctj_table):
+def read_line_info(_lns, _Aji, _line_ctj_dict):
     r"""
     read line information
     """
@@ -111,7 +114,7 @@ def read_line_info(_lns, _Aji, _line_ctj_table):
         # get line_index
         """
         try :
-            line_index = _line_ctj_table.index( ctj_ij )
+            line_index = _line_ctj_dict[ ctj_ij ]
         except ValueError:
             continue
         else:
@@ -125,8 +128,8 @@ def read_line_info(_lns, _Aji, _line_ctj_table):
         if _count == _Aji.size:
             break
         """
-        if ctj_ij in _line_ctj_table:
-            line_index = _line_ctj_table.index( ctj_ij )
+        if ctj_ij in _line_ctj_dict:
+            line_index = _line_ctj_dict[ ctj_ij ]
             _Aji[line_index] += float( _words[6] )
             _count += 1
 
@@ -157,7 +160,7 @@ def read_CE_Temperature(_lns):
 
     return _re, _nTe, _Te, _type
 
-def read_CE_table(_rs, _lns, _CE_table, _f1, _f2, _line_ctj_table):
+def read_CE_table(_rs, _lns, _CE_table, _f1, _f2, _line_ctj_dict):
     r"""
     read CE table for interpolation
     """
@@ -175,8 +178,8 @@ def read_CE_table(_rs, _lns, _CE_table, _f1, _f2, _line_ctj_table):
         # get ctj pair
         _ctj_ij = ( (_words[0],_words[1],_words[2]), (_words[3],_words[4],_words[5]) )
 
-        if _ctj_ij in _line_ctj_table:
-            line_index = _line_ctj_table.index( _ctj_ij )
+        if _ctj_ij in _line_ctj_dict:
+            line_index = _line_ctj_dict[ _ctj_ij ]
             _CE_table[line_index,:] += [float(v) for v in _words[6:-2]]
             _f1[line_index] = float(_words[-2])
             _f2[line_index] = float(_words[-1])
@@ -184,3 +187,110 @@ def read_CE_table(_rs, _lns, _CE_table, _f1, _f2, _line_ctj_table):
             _count += 1
 
     return None
+
+def read_line_pairs(_lns, _level_info_dict):
+    r"""
+    read line information of transitions listed in the file only
+
+    Returns
+    -------
+
+    _pairs : dict
+        (idxI, idxJ) --> Aji
+    """
+    _pairs = {}
+    for _i, _ln in enumerate(_lns[:]):
+
+        if skip_line(_ln):
+            continue
+        elif check_end(_ln):
+            break
+
+        _words = _ln.split()
+        _words = [_v.strip() for _v in _words]
+
+        # get level idx pair
+        _ctj_i = (_words[0],_words[1],_words[2])
+        _ctj_j = (_words[3],_words[4],_words[5])
+        if _ctj_i not in _level_info_dict or _ctj_j not in _level_info_dict:
+            continue
+        _idx = ( _level_info_dict[_ctj_i], _level_info_dict[_ctj_j] )
+        if _idx[0] >= _idx[1]:
+            continue
+
+        _pairs[_idx] = _pairs.get(_idx, 0.) + float( _words[6] )
+
+    return _pairs
+
+def read_CE_pairs(_rs, _lns, _level_info_dict):
+    r"""
+    read CE table of transitions listed in the file only
+
+    Returns
+    -------
+
+    _pairs : dict
+        (idxI, idxJ) --> [CE table row, f1, f2]
+    """
+    _pairs = {}
+    for _i, _ln in enumerate(_lns[_rs:]):
+
+        if skip_line(_ln):
+            continue
+        elif check_end(_ln):
+            break
+
+        _words = _ln.split()
+        _words = [_v.strip() for _v in _words]
+
+        # get level idx pair
+        _ctj_i = (_words[0],_words[1],_words[2])
+        _ctj_j = (_words[3],_words[4],_words[5])
+        if _ctj_i not in _level_info_dict or _ctj_j not in _level_info_dict:
+            continue
+        _idx = ( _level_info_dict[_ctj_i], _level_info_dict[_ctj_j] )
+        if _idx[0] >= _idx[1]:
+            continue
+
+        _row = [float(v) for v in _words[6:-2]]
+        if _idx in _pairs:
+            _row = [ _a + _b for _a, _b in zip(_pairs[_idx][0], _row) ]
+        _pairs[_idx] = [ _row, float(_words[-2]), float(_words[-1]) ]
+
+    return _pairs
+
+def get_cache_path(_cache_dir, _paths, _tag="atom"):
+    r"""
+    get the path of the binary cache file of an atomic model,
+    keyed by the absolute paths, sizes and modification times of its source files.
+
+    Parameters
+    ----------
+
+    _cache_dir : str
+        directory to store cache files
+
+    _paths : tuple of str or None
+        paths to source data files *.Level, *.Aji, *.Electron, *.Proton
+
+    _tag : str
+        prefix of the cache file name, default: "atom"
+
+    Returns
+    -------
+
+    _cache_path : str
+        path to the cache file *.npz
+    """
+    _keys = []
+    for _path in _paths:
+        if _path is None:
+            _keys.append( "None" )
+            continue
+        _stat = os.stat(_path)
+        _keys.append( "{}:{}:{}".format(os.path.abspath(_path), _stat.st_size, _stat.st_mtime_ns) )
+
+    _hash = hashlib.md5( "|".join(_keys).encode() ).hexdigest()
+    _cache_path = os.path.join(_cache_dir, _tag + "_" + _hash + ".npz")
+
+    return _cache_path